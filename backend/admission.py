@@ -0,0 +1,164 @@
+import math
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+
+MAX_TRACKED_USERS = 10000
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_sec)
+        self.updated = now
+
+    def try_take(self, cost: float = 1) -> float:
+        """Take ``cost`` tokens, returning 0 on success or the seconds until enough tokens exist."""
+        self._refill()
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0
+        return (cost - self.tokens) / self.refill_per_sec
+
+    def refund(self, cost: float = 1):
+        self.tokens = min(self.capacity, self.tokens + cost)
+
+
+class MongoTokenBuckets:
+    """Token buckets shared between workers, refilled and debited in one atomic update."""
+
+    def __init__(self, collection, capacity: float, refill_per_sec: float):
+        self.collection = collection
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+
+    async def try_take(self, key: str, cost: float = 1) -> float:
+        now = datetime.now(timezone.utc)
+        elapsed = {'$divide': [{'$subtract': [now, {'$ifNull': ['$updated', now]}]}, 1000]}
+        refilled = {'$min': [
+            self.capacity,
+            {'$add': [{'$ifNull': ['$tokens', self.capacity]}, {'$multiply': [elapsed, self.refill_per_sec]}]}
+        ]}
+        doc = await self.collection.find_one_and_update(
+            {'_id': key},
+            [
+                {'$set': {'tokens': refilled, 'updated': now}},
+                {'$set': {'allowed': {'$gte': ['$tokens', cost]}}},
+                {'$set': {'tokens': {'$cond': ['$allowed', {'$subtract': ['$tokens', cost]}, '$tokens']}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if doc['allowed']:
+            return 0
+        return (cost - doc['tokens']) / self.refill_per_sec
+
+    async def refund(self, key: str, cost: float = 1):
+        await self.collection.update_one(
+            {'_id': key},
+            [{'$set': {'tokens': {'$min': [self.capacity, {'$add': ['$tokens', cost]}]}}}]
+        )
+
+
+class AdmissionController:
+    """Per-user and global rate limits, plus load shedding when LLM calls back up.
+
+    The concurrent-call bound itself lives where calls are made
+    (``llm_client.CallLimiter``), since one generation fans out into several
+    calls. Rejections here are immediate: 429 when a rate limit is exhausted,
+    503 when the call queue is saturated, both with a Retry-After header.
+    """
+
+    def __init__(self, per_user_per_min: float, user_burst: float, global_per_min: float,
+                 global_burst: float, calls=None, shared_collection=None):
+        self.per_user_per_min = per_user_per_min
+        self.user_burst = user_burst
+        self.global_burst = global_burst
+        self.calls = calls
+        self.user_buckets: 'OrderedDict[str, TokenBucket]' = OrderedDict()
+        self.global_bucket = TokenBucket(global_burst, global_per_min / 60)
+        self.shared_users = None
+        self.shared_global = None
+        if shared_collection is not None:
+            self.shared_users = MongoTokenBuckets(shared_collection, user_burst, per_user_per_min / 60)
+            self.shared_global = MongoTokenBuckets(shared_collection, global_burst, global_per_min / 60)
+
+    @classmethod
+    def from_env(cls, db=None, calls=None):
+        shared = db.rate_limits if db is not None and os.environ.get('RATE_LIMIT_BACKEND') == 'mongo' else None
+        return cls(
+            per_user_per_min=float(os.environ.get('LLM_RATE_PER_USER', 10)),
+            # Large enough to admit a full bulk apply (server.MAX_BULK_APPLY) in one go.
+            user_burst=float(os.environ.get('LLM_BURST_PER_USER', 10)),
+            global_per_min=float(os.environ.get('LLM_RATE_GLOBAL', 300)),
+            global_burst=float(os.environ.get('LLM_BURST_GLOBAL', 30)),
+            calls=calls,
+            shared_collection=shared
+        )
+
+    @property
+    def max_cost(self) -> int:
+        """The most generations one request can be admitted for; the buckets never hold more."""
+        return int(min(self.user_burst, self.global_burst))
+
+    def _user_bucket(self, user_id: str) -> TokenBucket:
+        bucket = self.user_buckets.get(user_id)
+        if bucket is None:
+            bucket = TokenBucket(self.user_burst, self.per_user_per_min / 60)
+            self.user_buckets[user_id] = bucket
+            if len(self.user_buckets) > MAX_TRACKED_USERS:
+                self.user_buckets.popitem(last=False)
+        else:
+            self.user_buckets.move_to_end(user_id)
+        return bucket
+
+    async def _take_rate(self, user_id: str, cost: float):
+        if self.shared_users is not None:
+            wait = await self.shared_users.try_take(f'user:{user_id}', cost)
+            if wait:
+                reject(429, 'Rate limit exceeded for this user', wait)
+            wait = await self.shared_global.try_take('global', cost)
+            if wait:
+                await self.shared_users.refund(f'user:{user_id}', cost)
+                reject(429, 'Service is at its generation limit', wait)
+            return
+
+        bucket = self._user_bucket(user_id)
+        wait = bucket.try_take(cost)
+        if wait:
+            reject(429, 'Rate limit exceeded for this user', wait)
+        wait = self.global_bucket.try_take(cost)
+        if wait:
+            bucket.refund(cost)
+            reject(429, 'Service is at its generation limit', wait)
+
+    @asynccontextmanager
+    async def admit(self, user_id: str, cost: int = 1):
+        """Admit a request doing ``cost`` generations' worth of work."""
+        if cost > self.max_cost:
+            # The buckets can never hold this many tokens, so retrying would not help.
+            raise HTTPException(status_code=400, detail=f'At most {self.max_cost} generations can be requested at once')
+        # Checked before spending rate tokens so a saturated worker does not drain buckets.
+        if self.calls is not None and self.calls.saturated:
+            reject(503, 'Too many generations in progress', 1)
+        await self._take_rate(user_id, cost)
+        yield
+
+
+def reject(status_code: int, detail: str, retry_after: float):
+    raise HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={'Retry-After': str(max(1, math.ceil(retry_after)))}
+    )
@@ -0,0 +1,172 @@
+"""ATS keyword-coverage scoring of generated resumes.
+
+Terms and resume text are normalized to the same token stream (lowercase,
+punctuation-split, skill aliases folded onto one canonical spelling) and
+matched on whole tokens, so "Java" does not match inside "JavaScript".
+Scoring uses about 15 terms, which are looked up in the resume's token set
+(or, for multi-token terms, searched for in the space-joined tokens). Larger term sets switch to an Aho-Corasick
+automaton over tokens, which finds every term in a single pass.
+"""
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from keywords import SKILLS, TOKEN_RE
+
+# Skill aliases fold onto the canonical skill's tokens. Single-token aliases
+# are a plain dict lookup; multi-token ones are indexed by their first token.
+_SINGLE_ALIASES: Dict[str, Tuple[str, ...]] = {}
+_MULTI_ALIASES: Dict[str, List[Tuple[Tuple[str, ...], Tuple[str, ...]]]] = {}
+for _canonical, _aliases in SKILLS.items():
+    _target = tuple(TOKEN_RE.findall(_canonical.lower()))
+    for _alias in (_canonical.lower(),) + _aliases:
+        _tokens = tuple(TOKEN_RE.findall(_alias))
+        if len(_tokens) == 1:
+            _SINGLE_ALIASES[_tokens[0]] = _target
+        else:
+            _MULTI_ALIASES.setdefault(_tokens[0], []).append((_tokens, _target))
+for _candidates in _MULTI_ALIASES.values():
+    # Longest alias first, so "amazon web services" wins over a shorter prefix.
+    _candidates.sort(key=lambda pair: -len(pair[0]))
+
+# Tokens where folding may change something. Most resume tokens are not among
+# them, so normalization only steps through these positions in Python. An
+# alias that maps onto itself changes nothing, unless consuming it keeps a
+# later token from folding.
+_FOLD_STARTS = {token for token, target in _SINGLE_ALIASES.items() if target != (token,)}
+_FOLD_STARTS.update(first for first, candidates in _MULTI_ALIASES.items()
+                    if any(alias != target for alias, target in candidates))
+_FOLD_STARTS.update(first for first, candidates in _MULTI_ALIASES.items()
+                    if any(token in _FOLD_STARTS for alias, _ in candidates for token in alias[1:]))
+_FOLD_STARTS = frozenset(_FOLD_STARTS)
+
+# Below this many terms, set lookups and C-level substring searches beat
+# walking the automaton token by token in Python (benchmarks/bench_ats.py).
+AUTOMATON_MIN_TERMS = 64
+
+
+def _positions(tokens: List[str], wanted: Set[str]) -> List[int]:
+    positions = []
+    for token in wanted:
+        i = tokens.index(token)
+        while True:
+            positions.append(i)
+            try:
+                i = tokens.index(token, i + 1)
+            except ValueError:
+                break
+    positions.sort()
+    return positions
+
+
+def normalize(text: str) -> List[str]:
+    tokens = TOKEN_RE.findall(text.lower())
+    folding = _FOLD_STARTS.intersection(tokens)
+    if not folding:
+        return tokens
+    normalized: List[str] = []
+    done = 0
+    for i in _positions(tokens, folding):
+        if i < done:
+            continue
+        normalized += tokens[done:i]
+        token = tokens[i]
+        done = i + 1
+        for alias, target in _MULTI_ALIASES.get(token, ()):
+            if tuple(tokens[i:i + len(alias)]) == alias:
+                normalized += target
+                done = i + len(alias)
+                break
+        else:
+            normalized += _SINGLE_ALIASES.get(token, (token,))
+    normalized += tokens[done:]
+    return normalized
+
+
+class CoverageMatcher:
+    """Whole-token term matcher; an Aho-Corasick automaton over tokens for large term sets."""
+
+    def __init__(self, terms: Sequence[str], automaton: Optional[bool] = None):
+        self.terms = list(dict.fromkeys(term.strip() for term in terms if term and term.strip()))
+        if automaton is None:
+            automaton = len(self.terms) >= AUTOMATON_MIN_TERMS
+        self.automaton = automaton
+        if automaton:
+            self._build_automaton()
+        else:
+            # Single-token terms are looked up in the resume's token set; longer
+            # ones are padded so they only match a whole run of tokens. Terms
+            # that normalize to nothing can never match.
+            self._tokens: List[Tuple[int, str]] = []
+            self._phrases: List[Tuple[int, str]] = []
+            for index, tokens in enumerate(normalize(term) for term in self.terms):
+                if len(tokens) == 1:
+                    self._tokens.append((index, tokens[0]))
+                elif tokens:
+                    self._phrases.append((index, f" {' '.join(tokens)} "))
+
+    def _build_automaton(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+
+        for index, term in enumerate(self.terms):
+            state = 0
+            for token in normalize(term):
+                nxt = self._goto[state].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][token] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                state = nxt
+            if state:
+                self._out[state].add(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(token, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def matches(self, text: str) -> Set[int]:
+        if not self.automaton:
+            tokens = normalize(text)
+            present = set(tokens)
+            found = {index for index, token in self._tokens if token in present}
+            if self._phrases:
+                padded = f" {' '.join(tokens)} "
+                found.update(index for index, phrase in self._phrases if phrase in padded)
+            return found
+        found: Set[int] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for token in normalize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+    def score(self, text: str) -> dict:
+        found = self.matches(text)
+        matched = [term for i, term in enumerate(self.terms) if i in found]
+        missing = [term for i, term in enumerate(self.terms) if i not in found]
+        coverage = round(100 * len(matched) / len(self.terms)) if self.terms else None
+        return {'ats_score': coverage, 'matched_keywords': matched, 'missing_keywords': missing}
+
+
+@lru_cache(maxsize=1024)
+def matcher_for(terms: Tuple[str, ...]) -> CoverageMatcher:
+    return CoverageMatcher(terms)
+
+
+def score_resume(content: str, keywords: Sequence[str], requirements: Sequence[str] = ()) -> dict:
+    return matcher_for(tuple(keywords) + tuple(requirements)).score(content)
@@ -0,0 +1,83 @@
+"""Throughput of ATS coverage scoring: naive substring search vs both matcher modes.
+
+Naive search is one C-level substring scan per term over the raw text (and
+matches "java" inside "javascript"). The token scan does the same over the
+normalized tokens, so it pays for normalization once per resume and then
+grows linearly with the term count. The token automaton makes one pass per
+resume regardless of how many terms it holds. CoverageMatcher switches from
+the scan to the automaton at ats.AUTOMATON_MIN_TERMS.
+
+    python benchmarks/bench_ats.py --resumes 3000 --terms 15 20 100 400
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ats import CoverageMatcher  # noqa: E402
+from keywords import SKILLS  # noqa: E402
+
+FILLER = ('designed implemented delivered improved scalable reliable services pipelines dashboards customers '
+          'latency throughput migrated mentored engineers reduced costs by percent across teams').split()
+
+
+def synthetic_resumes(n, rng):
+    skills = list(SKILLS)
+
+    def bullet():
+        words = [rng.choice(FILLER) if rng.random() > 0.08 else rng.choice(skills) for _ in range(12)]
+        return f"- {' '.join(words).capitalize()}, {rng.choice(FILLER)} {rng.choice(FILLER)}."
+
+    return ['\n'.join(bullet() for _ in range(50)) for _ in range(n)]
+
+
+def naive_score(content, terms):
+    lowered = content.lower()
+    return [term for term in terms if term.lower() in lowered]
+
+
+def term_pool():
+    pool = list(SKILLS)
+    pool += [f'{a} {b}' for a in FILLER for b in FILLER if a != b]
+    return pool
+
+
+def run(resumes, terms):
+    resume_count = len(resumes)
+    term_count = len(terms)
+
+    started = time.perf_counter()
+    for content in resumes:
+        naive_score(content, terms)
+    naive = time.perf_counter() - started
+
+    rates = {}
+    for name, automaton in (('token scan', False), ('aho-corasick', True)):
+        matcher = CoverageMatcher(terms, automaton=automaton)
+        started = time.perf_counter()
+        for content in resumes:
+            matcher.score(content)
+        rates[name] = resume_count / (time.perf_counter() - started)
+
+    print(f'{term_count:>5} terms: naive {resume_count / naive:>8,.0f} resumes/s   ' +
+          '   '.join(f'{name} {rate:>7,.0f} resumes/s' for name, rate in rates.items()))
+
+
+def main(resume_count, term_counts):
+    rng = random.Random(3)
+    resumes = synthetic_resumes(resume_count, rng)
+    pool = term_pool()
+    print(f'{resume_count} resumes of 600 words')
+    for term_count in term_counts:
+        run(resumes, rng.sample(pool, term_count))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=3000)
+    parser.add_argument('--terms', type=int, nargs='+', default=[20, 100, 400])
+    args = parser.parse_args()
+    main(args.resumes, args.terms)
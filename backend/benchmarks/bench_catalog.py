@@ -0,0 +1,105 @@
+"""Measure snapshot publish/reload time and per-worker memory for the job catalog.
+
+Publishes a synthetic catalog, starts WORKERS fresh processes that each map it
+and score every job, and reports each worker's RSS split into private and shared
+pages (from /proc/self/smaps_rollup) alongside a heap-loaded baseline.
+
+    python benchmarks/bench_catalog.py --jobs 100000 --workers 4
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog import CatalogStore, publish  # noqa: E402
+
+SKILLS = ['Python', 'React', 'AWS', 'Docker', 'SQL', 'TypeScript', 'Kubernetes', 'FastAPI', 'Go', 'Rust',
+          'Machine Learning', 'PostgreSQL', 'MongoDB', 'Node.js', 'CSS', 'Linux', 'Terraform', 'Kafka']
+
+
+def synthetic_jobs(n):
+    rng = random.Random(42)
+    return [{
+        'id': f'job-{i}',
+        'title': f'Engineer {i}',
+        'company': f'Company {i % 5000}',
+        'location': 'Remote',
+        'description': 'Build and operate services. ' * 8,
+        'requirements': rng.sample(SKILLS, 5) + [f'{rng.randint(1, 10)}+ years experience'],
+        'salary_range': '$100k - $150k',
+        'job_type': 'Full-time',
+        'platform': rng.choice(['LinkedIn', 'Indeed', 'Wellfound']),
+        'posted_date': '2026-01-01T00:00:00+00:00',
+    } for i in range(n)]
+
+
+def memory_kb():
+    stats = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0].rstrip(':') in ('Rss', 'Pss', 'Shared_Clean', 'Private_Clean', 'Private_Dirty'):
+                stats[parts[0].rstrip(':')] = int(parts[1])
+    return stats
+
+
+def worker(directory, mode, jobs_count):
+    if mode == 'mmap':
+        snapshot = CatalogStore(directory).get()
+        scores = snapshot.matching_counts(['python', 'aws'])
+        total = sum(len(snapshot.job(i)['title']) for i in range(snapshot.n_jobs))
+    else:
+        jobs = synthetic_jobs(jobs_count)
+        scores = [sum(1 for r in j['requirements'] if 'python' in r.lower() or 'aws' in r.lower()) for j in jobs]
+        total = sum(len(j['title']) for j in jobs)
+    m = memory_kb()
+    print(f"{mode} rss={m['Rss']}KiB pss={m['Pss']}KiB private={m['Private_Clean'] + m['Private_Dirty']}KiB "
+                  f"shared={m['Shared_Clean']}KiB ({len(scores)} scored, {total})")
+
+
+def main(jobs_count, workers):
+    directory = Path(tempfile.mkdtemp(prefix='catalog-bench-'))
+    jobs = synthetic_jobs(jobs_count)
+
+    started = time.perf_counter()
+    path = publish(directory, jobs)
+    print(f'publish: {(time.perf_counter() - started) * 1000:.1f}ms, {path.stat().st_size / 1e6:.1f}MB')
+
+    store = CatalogStore(directory, refresh_seconds=0)
+    started = time.perf_counter()
+    store.get()
+    print(f'initial load: {(time.perf_counter() - started) * 1000:.2f}ms')
+    publish(directory, jobs)
+    started = time.perf_counter()
+    store.get()
+    print(f'reload after publish: {(time.perf_counter() - started) * 1000:.2f}ms')
+
+    started = time.perf_counter()
+    store.get().matching_counts(['python', 'aws'])
+    print(f'score {jobs_count} jobs: {(time.perf_counter() - started) * 1000:.1f}ms')
+
+    for mode in ('heap', 'mmap'):
+        procs = [
+            subprocess.Popen([sys.executable, __file__, '--worker', mode, '--dir', str(directory), '--jobs', str(jobs_count)])
+            for _ in range(workers)
+        ]
+        for proc in procs:
+            proc.wait()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--worker', choices=['heap', 'mmap'])
+    parser.add_argument('--dir')
+    args = parser.parse_args()
+    if args.worker:
+        worker(Path(args.dir), args.worker, args.jobs)
+    else:
+        main(args.jobs, args.workers)
@@ -0,0 +1,49 @@
+"""Round trips and prompt tokens per application, single vs batched cover letters.
+
+Runs the batcher against a fake LLM that answers batched prompts in the
+expected marker format, and compares prompt tokens with one single-job prompt
+per application.
+
+    python benchmarks/bench_cover_letters.py
+"""
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog import DEFAULT_JOBS, normalize_jobs  # noqa: E402
+from cover_letters import CoverLetterBatcher  # noqa: E402
+from prompts import build_cover_letter_prompt  # noqa: E402
+
+PROFILE = {
+    'name': 'Sample Candidate',
+    'skills': ['Python', 'FastAPI', 'PostgreSQL', 'Docker', 'AWS', 'React', 'TypeScript', 'Kubernetes',
+               'Machine Learning', 'SQL', 'CI/CD', 'Linux', 'Node.js', 'MongoDB', 'Figma'],
+}
+LETTER = 'Dear Hiring Manager,\n\n' + 'I am excited to apply for this role. ' * 12
+
+
+async def main():
+    jobs = normalize_jobs(DEFAULT_JOBS)
+    for n in (1, 2, 3, 5):
+        calls = []
+
+        async def fake_llm(name, prompt):
+            calls.append(prompt.tokens)
+            count = len(re.findall(r'^=== JOB \d+ ===$', prompt.text, re.MULTILINE)) or 1
+            if name == 'cover_letter_batch':
+                return '\n'.join(f'=== COVER LETTER {i} ===\n{LETTER}' for i in range(1, count + 1))
+            return LETTER
+
+        batcher = CoverLetterBatcher(fake_llm, max_batch=5)
+        letters = await batcher.request_many('bench-user', PROFILE, jobs[:n])
+        assert all(letters)
+        single_tokens = sum(build_cover_letter_prompt(job, PROFILE).tokens for job in jobs[:n])
+        print(f'{n} jobs: batched {len(calls)} round trip(s), {sum(calls) / n:.0f} prompt tokens/application; '
+              f'single {n} round trips, {single_tokens / n:.0f} prompt tokens/application')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
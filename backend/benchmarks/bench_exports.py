@@ -0,0 +1,95 @@
+"""Peak memory of streaming application exports as history grows.
+
+Feeds the NDJSON and CSV exporters from a stand-in cursor that produces
+synthetic applications lazily in driver-sized batches, like a Motor cursor,
+and records the tracemalloc peak while the chunks are drained. For
+comparison, it also measures the old approach of buffering the whole history
+in a list first.
+
+    python benchmarks/bench_exports.py [max_rows]
+"""
+import asyncio
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from exports import EXPORT_BATCH_SIZE, EXPORT_FIELDS, csv_chunks, ndjson_chunks  # noqa: E402
+
+STATUSES = ('Applied', 'Interview', 'Rejected', 'Offer')
+COVER_LETTER = 'Dear Hiring Manager,\n\n' + 'I am excited to apply for this role. ' * 20
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def application(i: int) -> dict:
+    return {
+        'id': str(uuid.UUID(int=i)),
+        'user_id': 'user-1',
+        'job_id': str(uuid.UUID(int=i % 5000)),
+        'job_title': 'Senior Software Engineer',
+        'company': 'Acme Corp',
+        'status': STATUSES[i % len(STATUSES)],
+        'resume_id': str(uuid.UUID(int=i + 1)),
+        'cover_letter': COVER_LETTER,
+        'applied_at': EPOCH + timedelta(minutes=i),
+        'updated_at': EPOCH + timedelta(minutes=i),
+    }
+
+
+class SyntheticCursor:
+    def __init__(self, rows: int, batch_size: int = EXPORT_BATCH_SIZE):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    async def __aiter__(self):
+        for start in range(0, self.rows, self.batch_size):
+            batch = [application(i) for i in range(start, min(start + self.batch_size, self.rows))]
+            await asyncio.sleep(0)
+            for doc in batch:
+                yield doc
+
+    async def to_list(self, length=None):
+        return [doc async for doc in self]
+
+
+async def measure(label: str, rows: int, drain):
+    tracemalloc.start()
+    written = await drain(SyntheticCursor(rows))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<10} rows={rows:>9,} peak={peak / 1e6:8.1f}MB output={written / 1e6:8.1f}MB')
+
+
+def streaming(chunks_fn):
+    async def drain(cursor):
+        written = 0
+        async for chunk in chunks_fn(cursor, EXPORT_FIELDS):
+            written += len(chunk)
+        return written
+    return drain
+
+
+async def buffered(cursor):
+    docs = await cursor.to_list(None)
+    return await streaming(ndjson_chunks)(_replay(docs))
+
+
+async def _replay(docs):
+    for doc in docs:
+        yield doc
+
+
+async def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sizes = [n for n in (10_000, 100_000, 1_000_000) if n <= max_rows]
+    for rows in sizes:
+        await measure('ndjson', rows, streaming(ndjson_chunks))
+        await measure('csv', rows, streaming(csv_chunks))
+    await measure('buffered', sizes[min(1, len(sizes) - 1)], buffered)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""Latency of local keyword extraction, and its overlap with real LLM keywords.
+
+Without arguments only latency is measured, over the built-in job
+descriptions. Overlap is reported only with --llm-file: JSON lines of
+{"title", "description", "keywords"} where the keywords are genuine LLM
+replies (e.g. exported from the resumes collection). The built-in jobs'
+requirements cannot serve as a reference, because the skills dictionary
+was written with those same phrases in view.
+
+    python benchmarks/bench_keywords.py [--llm-file samples.jsonl]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalog import DEFAULT_JOBS  # noqa: E402
+from keywords import KeywordExtractor, _canonical, job_text  # noqa: E402
+
+SAMPLES = [{'title': job['title'], 'description': job['description']} for job in DEFAULT_JOBS] + [
+    {'title': 'Platform Engineer',
+     'description': 'Own our Kubernetes platform on GCP. Terraform, CI/CD pipelines and Go or Python tooling. '
+                    'On-call for production incidents; Kafka experience a plus.'},
+]
+
+
+def normalize(keyword):
+    keyword = keyword.strip().lower()
+    canonical = _canonical(keyword)
+    return canonical.lower() if canonical else keyword
+
+
+def main(llm_file):
+    samples = [orjson.loads(line) for line in Path(llm_file).read_text().splitlines() if line.strip()] if llm_file else SAMPLES
+    extractor = KeywordExtractor(job_text(job) for job in DEFAULT_JOBS)
+
+    latencies, recalls, precisions = [], [], []
+    for sample in samples:
+        started = time.perf_counter()
+        local = extractor.extract(f"{sample['title']}. {sample['description']}")
+        latencies.append((time.perf_counter() - started) * 1000)
+        if 'keywords' not in sample:
+            print(f"{sample['title'][:28]:>28}: local={local}")
+            continue
+        local_set = {normalize(k) for k in local}
+        reference = {normalize(k) for k in sample['keywords']}
+        overlap = local_set & reference
+        recalls.append(len(overlap) / len(reference) if reference else 1)
+        precisions.append(len(overlap) / len(local_set) if local_set else 0)
+        print(f"{sample['title'][:28]:>28}: {len(overlap)}/{len(reference)} LLM keywords found; local={local}")
+
+    summary = f'\n{len(samples)} samples: local p50={statistics.median(latencies):.3f}ms max={max(latencies):.3f}ms'
+    if recalls:
+        summary += f'; mean recall={statistics.mean(recalls):.2f} mean precision={statistics.mean(precisions):.2f}'
+    print(summary)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--llm-file')
+    args = parser.parse_args()
+    main(args.llm_file)
@@ -0,0 +1,75 @@
+"""Tail latency and error rate of direct LLM calls vs the resilient client.
+
+Drives both against ``FakeLlmBackend`` with a long-tailed latency
+distribution (most calls fast, a few stalled) and injected connection
+faults, then reports p50/p95/p99 and the share of requests that failed.
+
+    python benchmarks/bench_llm_client.py [requests] [concurrency]
+"""
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from llm_client import CircuitBreaker, FakeLlmBackend, LlmClient  # noqa: E402
+
+FAULT_RATE = 0.02
+
+
+def long_tail(rng: random.Random):
+    def sample() -> float:
+        if rng.random() < 0.03:
+            return rng.uniform(2.0, 4.0)
+        return rng.lognormvariate(-2.3, 0.35)
+    return sample
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(name: str, call, requests: int, concurrency: int, backend: FakeLlmBackend):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call(f'bench_{i}', 'system', 'prompt')
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    print(f'{name:<22} p50={percentile(latencies, 50):7.0f}ms p95={percentile(latencies, 95):7.0f}ms '
+          f'p99={percentile(latencies, 99):7.0f}ms errors={errors / requests:6.2%} '
+          f'backend_calls/request={backend.calls / requests:.2f} wall={elapsed:.1f}s')
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    direct = FakeLlmBackend(latency=long_tail(random.Random(1)), fault_rate=FAULT_RATE, seed=1)
+    await run('direct', direct, requests, concurrency, direct)
+
+    retry_only = FakeLlmBackend(latency=long_tail(random.Random(1)), fault_rate=FAULT_RATE, seed=1)
+    client = LlmClient(retry_only, hedge=False, backoff_max=0.5, breaker=CircuitBreaker(failure_threshold=50))
+    await run('retries', client.complete, requests, concurrency, retry_only)
+
+    hedged = FakeLlmBackend(latency=long_tail(random.Random(1)), fault_rate=FAULT_RATE, seed=1)
+    client = LlmClient(hedged, hedge_floor=0.1, backoff_max=0.5, breaker=CircuitBreaker(failure_threshold=50))
+    await run('retries+hedging', client.complete, requests, concurrency, hedged)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""Token distribution of resume prompts with and without the budget.
+
+Builds prompts for synthetic profiles of growing size against a sample job
+and prints the token percentiles for the unbounded (legacy) and budgeted
+builders, plus the builder's own overhead.
+
+    python benchmarks/bench_prompts.py
+"""
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prompts import RESUME_PROMPT_BUDGET, build_resume_prompt  # noqa: E402
+
+JOB_TITLE = 'Backend Developer'
+JOB_DESCRIPTION = ('Backend developer for building scalable APIs. Experience with Python, FastAPI, '
+                   'PostgreSQL, Docker and AWS required. ') * 20
+TOPICS = ['Python', 'FastAPI', 'React', 'Kubernetes', 'Figma', 'Excel', 'Go', 'PostgreSQL', 'Marketing', 'AWS']
+
+
+def synthetic_profile(rng, entries):
+    def sentence():
+        return ' '.join(rng.choice(TOPICS) + ' ' + rng.choice(['services', 'pipelines', 'dashboards', 'campaigns'])
+                        for _ in range(rng.randint(5, 30)))
+
+    return {
+        'name': 'Sample Candidate',
+        'email': 'candidate@example.com',
+        'summary': sentence(),
+        'skills': rng.sample(TOPICS, 6),
+        'education': [{'degree': 'BSc', 'field': 'CS', 'institution': f'University {i}', 'year': str(2000 + i)}
+                      for i in range(max(1, entries // 5))],
+        'experience': [{'title': 'Engineer', 'company': f'Company {i}', 'duration': '2 years', 'description': sentence()}
+                       for i in range(entries)],
+        'projects': [{'name': f'Project {i}', 'description': sentence()} for i in range(entries)],
+    }
+
+
+def pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def main():
+    rng = random.Random(7)
+    profiles = [synthetic_profile(rng, rng.choice([1, 3, 5, 10, 20, 40])) for _ in range(200)]
+
+    for label, budget in (('unbounded', 10 ** 9), (f'budget={RESUME_PROMPT_BUDGET}', RESUME_PROMPT_BUDGET)):
+        started = time.perf_counter()
+        tokens = [build_resume_prompt(p, JOB_TITLE, JOB_DESCRIPTION, budget).tokens for p in profiles]
+        elapsed = (time.perf_counter() - started) * 1000 / len(profiles)
+        print(f'{label:>12}: p50={statistics.median(tokens):.0f} p95={pct(tokens, 95)} max={max(tokens)} '
+              f'tokens, build {elapsed:.2f}ms/prompt')
+
+
+if __name__ == '__main__':
+    main()
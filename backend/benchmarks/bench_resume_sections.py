@@ -0,0 +1,94 @@
+"""LLM calls and latency saved by section-level resume caching.
+
+Generates resumes for one profile against a sequence of jobs (a repeat, a
+similar job, an unrelated job, then a small profile edit) with a fake LLM of
+fixed latency and an in-memory section cache, and compares against the
+monolithic single-call flow.
+
+    python benchmarks/bench_resume_sections.py --llm-latency 2.0
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from resume_sections import SectionCache, generate_sections  # noqa: E402
+
+PROFILE = {
+    'user_id': 'bench-user',
+    'name': 'Sample Candidate',
+    'email': 'candidate@example.com',
+    'phone': '+1 555 0100',
+    'location': 'Seattle, WA',
+    'summary': 'Backend engineer who builds Python APIs and data pipelines.',
+    'skills': ['Python', 'FastAPI', 'PostgreSQL', 'Docker', 'AWS', 'React'],
+    'education': [{'degree': 'BSc', 'field': 'Computer Science', 'institution': 'State University', 'year': '2018'}],
+    'experience': [
+        {'title': 'Backend Engineer', 'company': 'ServerTech', 'duration': '2021-2024',
+         'description': 'Built Python and FastAPI services on AWS with PostgreSQL.'},
+        {'title': 'Software Developer', 'company': 'WebWorks', 'duration': '2018-2021',
+         'description': 'Maintained React front ends and Docker based deployments.'},
+    ],
+    'projects': [{'name': 'AutoApply AI', 'description': 'Job application agent built with FastAPI and MongoDB.'}],
+}
+
+JOBS = [
+    ('Backend Developer', 'Backend developer for scalable APIs. Experience with Python, FastAPI and PostgreSQL required.'),
+    ('Backend Developer', 'Backend developer for scalable APIs. Experience with Python, FastAPI and PostgreSQL required.'),
+    ('Backend Developer', 'We need a backend developer: Python, FastAPI, PostgreSQL and scalable API design.'),
+    ('DevOps Engineer', 'DevOps engineer to manage cloud infrastructure with AWS, Docker and Kubernetes.'),
+]
+
+
+class MemorySectionCache(SectionCache):
+    def __init__(self):
+        self.store = {}
+
+    async def get_many(self, keys):
+        return {key: self.store[key] for key in keys if key in self.store}
+
+    async def put(self, key, content):
+        self.store[key] = content
+
+    async def touch(self, keys):
+        pass
+
+
+async def main(latency):
+    calls = 0
+
+    async def fake_llm(name, prompt):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(latency)
+        return f'{name} body'
+
+    cache = MemorySectionCache()
+    runs = [(PROFILE, title, description) for title, description in JOBS]
+    edited = dict(PROFILE, projects=PROFILE['projects'] + [{'name': 'Resume Parser', 'description': 'Python PDF parsing tool.'}])
+    runs.append((edited, *JOBS[0]))
+
+    total_calls = 0
+    total_ms = 0
+    for i, (profile, title, description) in enumerate(runs):
+        calls = 0
+        started = time.perf_counter()
+        result = await generate_sections(profile, title, description, cache, fake_llm, 'fake-model')
+        elapsed = (time.perf_counter() - started) * 1000
+        total_calls += calls
+        total_ms += elapsed
+        print(f'resume {i + 1}: {calls} LLM calls, {elapsed:.0f}ms, reused {result.reused}')
+
+    # The monolithic flow is one sequential call per resume over the whole profile.
+    print(f'sectioned: {total_calls} calls, {total_ms:.0f}ms total')
+    print(f'monolithic: {len(runs)} calls, {len(runs) * latency * 1000:.0f}ms total (one long call each)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--llm-latency', type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(main(args.llm_latency))
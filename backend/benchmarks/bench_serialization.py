@@ -0,0 +1,74 @@
+"""Compare the old and new response serialization paths on large application lists.
+
+Old: ISO strings in the documents, FastAPI's jsonable_encoder (when installed)
+followed by Starlette's json.dumps. New: native datetimes passed straight to
+orjson, as ORJSONResponse does.
+
+    python benchmarks/bench_serialization.py
+"""
+import json
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+
+import orjson
+
+try:
+    from fastapi.encoders import jsonable_encoder
+except ImportError:
+    jsonable_encoder = None
+
+STATUSES = ['Applied', 'Interview', 'Rejected', 'Offer']
+
+
+def make_applications(n: int, native_dates: bool) -> list:
+    now = datetime.now(timezone.utc)
+    apps = []
+    for i in range(n):
+        applied = now - timedelta(minutes=i)
+        apps.append({
+            'id': str(uuid.uuid4()),
+            'user_id': 'bench-user',
+            'job_id': str(uuid.uuid4()),
+            'job_title': 'Senior Full Stack Developer',
+            'company': 'TechCorp',
+            'status': STATUSES[i % len(STATUSES)],
+            'resume_id': str(uuid.uuid4()),
+            'cover_letter': 'Dear Hiring Manager, ' * 40,
+            'applied_at': applied if native_dates else applied.isoformat(),
+            'updated_at': applied if native_dates else applied.isoformat(),
+        })
+    return apps
+
+
+def old_path(apps):
+    content = {'applications': apps}
+    if jsonable_encoder:
+        content = jsonable_encoder(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')).encode('utf-8')
+
+
+def new_path(apps):
+    return orjson.dumps({'applications': apps})
+
+
+def best_of(fn, arg, repeat=5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    label = 'jsonable_encoder + json' if jsonable_encoder else 'json (fastapi not installed)'
+    print(f"{'apps':>8}  {label:>30}  {'orjson':>10}  speedup")
+    for n in (1_000, 10_000, 100_000):
+        old = best_of(old_path, make_applications(n, native_dates=False))
+        new = best_of(new_path, make_applications(n, native_dates=True))
+        print(f'{n:>8}  {old * 1000:>28.1f}ms  {new * 1000:>8.1f}ms  {old / new:>6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
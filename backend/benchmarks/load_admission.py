@@ -0,0 +1,97 @@
+"""Overload /api/resume/generate and watch cheap-endpoint latency.
+
+Registers USERS throwaway users with profiles, fires CONCURRENCY generate
+requests in waves for DURATION seconds, and samples /api/health and
+/api/profile latency alongside. With admission control enabled the generate
+requests should resolve quickly to 429/503 once saturated, and the cheap
+endpoints' p99 should stay flat. Run the server with LLM_BACKEND=fake to load
+it without a provider key.
+
+    python benchmarks/load_admission.py http://localhost:8001 --concurrency 200 --duration 30 --users 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+
+def percentile(samples, pct):
+    if not samples:
+        return float('nan')
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+PROFILE = {
+    'name': 'Load Test', 'email': 'load@example.com', 'summary': 'Backend engineer.',
+    'skills': ['Python', 'FastAPI', 'MongoDB', 'Docker'],
+    'experience': [{'title': 'Engineer', 'company': 'Acme', 'duration': '3 years', 'description': 'Built APIs in Python.'}],
+    'education': [{'degree': 'BSc', 'field': 'Computer Science', 'institution': 'State University', 'year': '2018'}],
+    'projects': [{'name': 'Scheduler', 'description': 'A FastAPI job scheduler backed by MongoDB.'}],
+}
+
+
+async def register(client):
+    email = f'load_{uuid.uuid4().hex[:8]}@example.com'
+    response = await client.post('/api/auth/register', json={'email': email, 'password': 'LoadTest123!', 'name': 'Load Test'})
+    body = response.json()
+    headers = {'Authorization': f"Bearer {body['token']}"}
+    await client.put('/api/profile', json={**PROFILE, 'user_id': body['user']['id']}, headers=headers)
+    return headers
+
+
+async def hammer(client, headers, deadline, statuses):
+    body = {'job_title': 'Backend Developer', 'job_description': 'Python, FastAPI and MongoDB.'}
+    while time.monotonic() < deadline:
+        try:
+            response = await client.post('/api/resume/generate', json=body, headers=headers, timeout=120)
+            statuses[response.status_code] += 1
+            if response.status_code in (429, 503):
+                await asyncio.sleep(min(float(response.headers.get('Retry-After', 1)), 1))
+        except httpx.HTTPError:
+            statuses['error'] += 1
+
+
+async def probe(client, path, headers, deadline, samples):
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        await client.get(path, headers=headers)
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.05)
+
+
+async def main(base_url, concurrency, duration, users):
+    limits = httpx.Limits(max_connections=concurrency + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        user_headers = [await register(client) for _ in range(users)]
+        headers = user_headers[0]
+
+        deadline = time.monotonic() + duration
+        statuses = Counter()
+        health, profile = [], []
+        # Probes get their own connection pool so they never queue behind the hammering requests.
+        async with httpx.AsyncClient(base_url=base_url) as probe_client:
+            await asyncio.gather(
+                *(hammer(client, user_headers[i % users], deadline, statuses) for i in range(concurrency)),
+                probe(probe_client, '/api/health', {}, deadline, health),
+                probe(probe_client, '/api/profile', headers, deadline, profile),
+            )
+
+    print(f'generate responses: {dict(statuses)}')
+    for name, samples in (('health', health), ('profile', profile)):
+        print(f'{name:>8}: n={len(samples)} p50={statistics.median(samples):.1f}ms '
+              f'p99={percentile(samples, 99):.1f}ms max={max(samples):.1f}ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('base_url')
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--users', type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(main(args.base_url, args.concurrency, args.duration, args.users))
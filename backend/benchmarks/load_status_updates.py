@@ -0,0 +1,89 @@
+"""Throughput of bulk status updates vs one PUT per application.
+
+Registers a throwaway user, seeds applications for it straight into MongoDB
+(MONGO_URL / DB_NAME, as the server uses), then moves them through the
+pipeline statuses with N sequential PUTs, N concurrent PUTs, and one
+POST /api/applications/status/bulk per batch.
+
+    python benchmarks/load_status_updates.py http://localhost:8001 --applications 500 --batch 100
+
+``run`` takes the HTTP client and database as arguments, so it can also be
+driven in-process against an ASGI transport.
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+STATUSES = ('Interview', 'Rejected', 'Offer', 'Applied')
+
+
+async def seed(db, user_id: str, count: int):
+    now = datetime.now(timezone.utc)
+    docs = [{
+        'id': str(uuid.uuid4()), 'user_id': user_id, 'job_id': f'load-{i}', 'job_title': 'Load Test Engineer',
+        'company': 'Load Co', 'status': 'Applied', 'resume_id': 'load', 'cover_letter': '',
+        'applied_at': now, 'updated_at': now,
+    } for i in range(count)]
+    await db.applications.insert_many(docs)
+    return [doc['id'] for doc in docs]
+
+
+def report(name: str, count: int, elapsed: float, requests: int):
+    print(f'{name:<16} {count} updates in {elapsed * 1000:8.1f}ms  {count / elapsed:9.0f} updates/s  '
+          f'{requests} requests')
+
+
+async def run(client: httpx.AsyncClient, db, applications: int, batch: int):
+    email = f'load_{uuid.uuid4().hex[:8]}@example.com'
+    response = await client.post('/api/auth/register', json={'email': email, 'password': 'LoadTest123!', 'name': 'Load Test'})
+    body = response.json()
+    headers = {'Authorization': f"Bearer {body['token']}"}
+    ids = await seed(db, body['user']['id'], applications)
+
+    status = STATUSES[0]
+    started = time.perf_counter()
+    for application_id in ids:
+        response = await client.put(f'/api/applications/{application_id}', json={'status': status}, headers=headers)
+        response.raise_for_status()
+    report('sequential PUT', len(ids), time.perf_counter() - started, len(ids))
+
+    status = STATUSES[1]
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(
+        client.put(f'/api/applications/{application_id}', json={'status': status}, headers=headers)
+        for application_id in ids
+    ))
+    assert all(response.status_code == 200 for response in responses)
+    report('concurrent PUT', len(ids), time.perf_counter() - started, len(ids))
+
+    status = STATUSES[2]
+    started = time.perf_counter()
+    for start in range(0, len(ids), batch):
+        updates = [{'id': application_id, 'status': status} for application_id in ids[start:start + batch]]
+        response = await client.post('/api/applications/status/bulk', json={'updates': updates}, headers=headers)
+        assert all(result['status_code'] == 200 for result in response.json()['results'])
+    report('bulk', len(ids), time.perf_counter() - started, -(-len(ids) // batch))
+
+
+async def main(base_url: str, applications: int, batch: int):
+    mongo = AsyncIOMotorClient(os.environ.get('MONGO_URL', 'mongodb://localhost:27017'))
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            await run(client, mongo[os.environ.get('DB_NAME', 'test_database')], applications, batch)
+    finally:
+        mongo.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('base_url')
+    parser.add_argument('--applications', type=int, default=500)
+    parser.add_argument('--batch', type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.base_url, args.applications, args.batch))
@@ -0,0 +1,387 @@
+"""Versioned, memory-mapped job catalog snapshots shared by all uvicorn workers.
+
+A snapshot is a single read-only file. Workers mmap it, so the page cache
+holds one copy of the catalog no matter how many processes serve it.
+Publishing writes a new file and atomically repoints ``CURRENT``; workers
+notice on their next refresh check and swap to the new mapping.
+
+File layout (little-endian):
+
+    header        magic, format version, snapshot version, job/term counts
+    sections      (offset, length) for each of the arrays below
+    term_offsets  u32[n_terms + 1]  offsets into term_blob
+    term_blob     utf-8 lowercased requirement terms
+    job_terms     u32[n_jobs + 1]   CSR row offsets into term_ids
+    term_ids      u32[...]          requirement term ids per job
+    rec_offsets   u32[n_jobs + 1]   offsets into rec_blob
+    rec_blob      orjson-encoded job records
+    df_offsets    u32[n_phrases + 1] offsets into df_blob
+    df_blob       utf-8 keyword candidate phrases, sorted bytewise
+    df_counts     u32[n_phrases]    number of jobs containing each phrase
+
+The document frequencies are computed once by the publisher, so workers can
+score ad-hoc job descriptions without re-reading every job. Format 1 files
+(no frequency sections) are still readable.
+
+    python catalog.py publish [jobs.json]
+"""
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import orjson
+
+from keywords import KeywordExtractor, job_text
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'AJCS'
+FORMAT_VERSION = 2
+SECTIONS = ('term_offsets', 'term_blob', 'job_terms', 'term_ids', 'rec_offsets', 'rec_blob',
+            'df_offsets', 'df_blob', 'df_counts')
+SECTIONS_BY_FORMAT = {1: SECTIONS[:6], 2: SECTIONS}
+HEADER = struct.Struct('<4sHHQII')
+SECTION = struct.Struct('<QQ')
+CURRENT = 'CURRENT'
+
+DEFAULT_JOBS = [
+    {
+        'title': 'Senior Full Stack Developer',
+        'company': 'TechCorp',
+        'location': 'San Francisco, CA',
+        'description': 'We are looking for an experienced Full Stack Developer to join our team. Must have expertise in React, Node.js, and MongoDB.',
+        'requirements': ['React', 'Node.js', 'MongoDB', 'REST APIs', '5+ years experience'],
+        'salary_range': '$120k - $180k',
+        'job_type': 'Full-time',
+        'platform': 'LinkedIn',
+        'posted_days_ago': 2
+    },
+    {
+        'title': 'AI/ML Engineer',
+        'company': 'InnovateLabs',
+        'location': 'Remote',
+        'description': 'Join our AI team to build cutting-edge machine learning solutions. Experience with Python, TensorFlow, and large-scale data processing required.',
+        'requirements': ['Python', 'TensorFlow', 'PyTorch', 'Machine Learning', 'Deep Learning'],
+        'salary_range': '$140k - $200k',
+        'job_type': 'Full-time',
+        'platform': 'Indeed',
+        'posted_days_ago': 1
+    },
+    {
+        'title': 'Frontend Developer',
+        'company': 'DesignCo',
+        'location': 'New York, NY',
+        'description': 'Creative frontend developer needed for building beautiful user interfaces. Must be proficient in React, TypeScript, and modern CSS.',
+        'requirements': ['React', 'TypeScript', 'CSS', 'Responsive Design', 'Figma'],
+        'salary_range': '$90k - $130k',
+        'job_type': 'Full-time',
+        'platform': 'Wellfound',
+        'posted_days_ago': 3
+    },
+    {
+        'title': 'DevOps Engineer',
+        'company': 'CloudSystems',
+        'location': 'Austin, TX',
+        'description': 'DevOps engineer to manage our cloud infrastructure. Experience with AWS, Docker, and Kubernetes is essential.',
+        'requirements': ['AWS', 'Docker', 'Kubernetes', 'CI/CD', 'Linux'],
+        'salary_range': '$110k - $160k',
+        'job_type': 'Full-time',
+        'platform': 'LinkedIn',
+        'posted_days_ago': 5
+    },
+    {
+        'title': 'Data Scientist',
+        'company': 'DataDrive',
+        'location': 'Boston, MA',
+        'description': 'Data scientist to analyze large datasets and build predictive models. Strong statistical background required.',
+        'requirements': ['Python', 'SQL', 'Statistics', 'Machine Learning', 'Data Visualization'],
+        'salary_range': '$100k - $150k',
+        'job_type': 'Full-time',
+        'platform': 'Indeed',
+        'posted_days_ago': 4
+    },
+    {
+        'title': 'Backend Developer',
+        'company': 'ServerTech',
+        'location': 'Seattle, WA',
+        'description': 'Backend developer for building scalable APIs. Experience with Python, FastAPI, and PostgreSQL required.',
+        'requirements': ['Python', 'FastAPI', 'PostgreSQL', 'REST APIs', 'Microservices'],
+        'salary_range': '$105k - $145k',
+        'job_type': 'Full-time',
+        'platform': 'Wellfound',
+        'posted_days_ago': 6
+    }
+]
+
+
+def normalize_jobs(jobs: List[dict], extractor: Optional[KeywordExtractor] = None) -> List[dict]:
+    """Give every job a stable id, an absolute posted_date and its extracted keywords."""
+    now = datetime.now(timezone.utc)
+    if extractor is None:
+        extractor = KeywordExtractor(job_text(job) for job in jobs)
+    normalized = []
+    for job in jobs:
+        job = dict(job)
+        days_ago = job.pop('posted_days_ago', None)
+        if 'posted_date' not in job:
+            job['posted_date'] = (now - timedelta(days=days_ago or 0)).isoformat()
+        job.setdefault('id', str(uuid.uuid5(uuid.NAMESPACE_URL, f"{job['company']}/{job['title']}")))
+        if 'keywords' not in job:
+            job['keywords'] = extractor.extract(job_text(job))
+        normalized.append(job)
+    return normalized
+
+
+def _u32(values) -> bytes:
+    return struct.pack(f'<{len(values)}I', *values)
+
+
+def encode_snapshot(jobs: List[dict], version: int, df: Optional[Dict[str, int]] = None) -> bytes:
+    term_index = {}
+    term_blob = bytearray()
+    term_offsets = [0]
+    job_terms = [0]
+    term_ids = []
+    rec_blob = bytearray()
+    rec_offsets = [0]
+
+    for job in jobs:
+        for requirement in job['requirements']:
+            term = requirement.lower()
+            if term not in term_index:
+                term_index[term] = len(term_index)
+                term_blob += term.encode('utf-8')
+                term_offsets.append(len(term_blob))
+            term_ids.append(term_index[term])
+        job_terms.append(len(term_ids))
+        rec_blob += orjson.dumps(job)
+        rec_offsets.append(len(rec_blob))
+
+    if df is None:
+        df = KeywordExtractor(job_text(job) for job in jobs).df
+    df_blob = bytearray()
+    df_offsets = [0]
+    df_counts = []
+    for phrase, count in sorted((phrase.encode('utf-8'), count) for phrase, count in df.items()):
+        df_blob += phrase
+        df_offsets.append(len(df_blob))
+        df_counts.append(count)
+
+    sections = {
+        'term_offsets': _u32(term_offsets),
+        'term_blob': bytes(term_blob),
+        'job_terms': _u32(job_terms),
+        'term_ids': _u32(term_ids),
+        'rec_offsets': _u32(rec_offsets),
+        'rec_blob': bytes(rec_blob),
+        'df_offsets': _u32(df_offsets),
+        'df_blob': bytes(df_blob),
+        'df_counts': _u32(df_counts),
+    }
+
+    offset = HEADER.size + SECTION.size * len(SECTIONS)
+    table = bytearray()
+    body = bytearray()
+    for name in SECTIONS:
+        # Align each array so memoryview.cast('I') gets word-aligned data.
+        padding = -(offset + len(body)) % 8
+        body += b'\0' * padding
+        table += SECTION.pack(offset + len(body), len(sections[name]))
+        body += sections[name]
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, version, len(jobs), len(term_index))
+    return header + bytes(table) + bytes(body)
+
+
+class FrequencyTable:
+    """Read-only phrase -> document frequency lookups straight from the mmap.
+
+    Binary search over the sorted phrases, with a bounded memo for the
+    phrases recent descriptions asked about.
+    """
+
+    MAX_MEMO = 50000
+
+    def __init__(self, offsets: memoryview, blob: memoryview, counts: memoryview):
+        self.offsets = offsets
+        self.blob = blob
+        self.counts = counts
+        self._memo: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def get(self, phrase: str, default: int = 0) -> int:
+        count = self._memo.get(phrase)
+        if count is None:
+            count = self._search(phrase.encode('utf-8'))
+            if len(self._memo) >= self.MAX_MEMO:
+                self._memo.clear()
+            self._memo[phrase] = count
+        return count if count else default
+
+    def _search(self, key: bytes) -> int:
+        offsets, blob = self.offsets, self.blob
+        lo, hi = 0, len(self.counts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = bytes(blob[offsets[mid]:offsets[mid + 1]])
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return self.counts[mid]
+        return 0
+
+
+class CatalogSnapshot:
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, fmt, _, self.version, self.n_jobs, self.n_terms = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or fmt not in SECTIONS_BY_FORMAT:
+            raise ValueError(f'{path} is not a supported catalog snapshot')
+
+        sections = {}
+        for i, name in enumerate(SECTIONS_BY_FORMAT[fmt]):
+            offset, length = SECTION.unpack_from(view, HEADER.size + SECTION.size * i)
+            sections[name] = view[offset:offset + length]
+
+        self.term_offsets = sections['term_offsets'].cast('I')
+        self.term_blob = sections['term_blob']
+        self.job_terms = sections['job_terms'].cast('I')
+        self.term_ids = sections['term_ids'].cast('I')
+        self.rec_offsets = sections['rec_offsets'].cast('I')
+        self.rec_blob = sections['rec_blob']
+        self._terms: Optional[List[str]] = None
+        self._keyword_extractor: Optional[KeywordExtractor] = None
+        if 'df_counts' in sections:
+            frequencies = FrequencyTable(
+                sections['df_offsets'].cast('I'), sections['df_blob'], sections['df_counts'].cast('I')
+            )
+            self._keyword_extractor = KeywordExtractor.from_frequencies(self.n_jobs, frequencies)
+
+    @property
+    def terms(self) -> List[str]:
+        if self._terms is None:
+            offsets = self.term_offsets
+            blob = self.term_blob
+            self._terms = [bytes(blob[offsets[i]:offsets[i + 1]]).decode('utf-8') for i in range(self.n_terms)]
+        return self._terms
+
+    @property
+    def keyword_extractor(self) -> KeywordExtractor:
+        """Document frequencies over this snapshot's jobs, for ad-hoc descriptions."""
+        if self._keyword_extractor is None:
+            # Format 1 snapshots carry no frequencies; rebuild them from the records.
+            self._keyword_extractor = KeywordExtractor(job_text(self.job(i)) for i in range(self.n_jobs))
+        return self._keyword_extractor
+
+    def job(self, index: int) -> dict:
+        return orjson.loads(self.rec_blob[self.rec_offsets[index]:self.rec_offsets[index + 1]])
+
+    def requirement_count(self, index: int) -> int:
+        return self.job_terms[index + 1] - self.job_terms[index]
+
+    def matching_counts(self, skills: List[str]) -> List[int]:
+        """Per job, how many requirements contain at least one of the skills."""
+        lowered = [skill.lower() for skill in skills]
+        mask = bytes(any(skill in term for skill in lowered) for term in self.terms)
+        job_terms = self.job_terms
+        term_ids = self.term_ids
+        return [
+            sum(mask[term_ids[j]] for j in range(job_terms[i], job_terms[i + 1]))
+            for i in range(self.n_jobs)
+        ]
+
+
+def publish(directory: Path, jobs: List[dict]) -> Path:
+    """Write a new snapshot and atomically make it the current one."""
+    directory.mkdir(parents=True, exist_ok=True)
+    version = time.time_ns()
+    path = directory / f'catalog-{version}.bin'
+    extractor = KeywordExtractor(job_text(job) for job in jobs)
+    _atomic_write(path, encode_snapshot(normalize_jobs(jobs, extractor), version, extractor.df))
+    _atomic_write(directory / CURRENT, path.name.encode('utf-8'))
+    # Keep the previous snapshot so a worker that read the old CURRENT can still open it.
+    for old in sorted(directory.glob('catalog-*.bin'))[:-2]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+def _atomic_write(path: Path, data: bytes):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def current_rss_kb() -> int:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except OSError:
+        return 0
+
+
+class CatalogStore:
+    """Holds the worker's current snapshot and swaps it when a new one is published."""
+
+    def __init__(self, directory: Path, refresh_seconds: float = 5):
+        self.directory = directory
+        self.refresh_seconds = refresh_seconds
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self._current_name: Optional[str] = None
+        self._checked = 0.0
+
+    def ensure_published(self, jobs: List[dict]):
+        if not (self.directory / CURRENT).exists():
+            publish(self.directory, jobs)
+
+    def get(self) -> CatalogSnapshot:
+        now = time.monotonic()
+        if self.snapshot is None or now - self._checked >= self.refresh_seconds:
+            self._checked = now
+            self.refresh()
+        return self.snapshot
+
+    def refresh(self):
+        name = (self.directory / CURRENT).read_text().strip()
+        if name == self._current_name:
+            return
+        started = time.perf_counter()
+        snapshot = CatalogSnapshot(self.directory / name)
+        # Swapping the reference is atomic; requests already holding the old
+        # snapshot keep its mapping alive until they finish.
+        self.snapshot = snapshot
+        self._current_name = name
+        logger.info(
+            f'Loaded catalog snapshot {snapshot.version} ({snapshot.n_jobs} jobs, {snapshot.n_terms} terms) '
+            f'in {(time.perf_counter() - started) * 1000:.2f}ms, worker RSS {current_rss_kb()} KiB'
+        )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'publish':
+        sys.exit('usage: python catalog.py publish [jobs.json]')
+    jobs = orjson.loads(Path(sys.argv[2]).read_bytes()) if len(sys.argv) > 2 else DEFAULT_JOBS
+    directory = Path(os.environ.get('CATALOG_DIR', Path(__file__).parent / 'catalog'))
+    print(f'Published {publish(directory, jobs)}')
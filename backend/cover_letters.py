@@ -0,0 +1,117 @@
+"""Batches cover-letter generation for a user's concurrent applications.
+
+Requests for the same user that arrive within a short window (or together
+through ``request_many``) are sent as one multi-job prompt, so the candidate
+context is paid for once per batch instead of once per job. Replies are split
+on the ``=== COVER LETTER n ===`` markers; any letter that cannot be parsed
+out is regenerated with the single-job prompt.
+"""
+import asyncio
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import metrics
+from prompts import BuiltPrompt, build_batch_cover_letter_prompt, build_cover_letter_prompt
+
+logger = logging.getLogger(__name__)
+
+BATCH_WINDOW_SECONDS = float(os.environ.get('COVER_LETTER_BATCH_WINDOW_MS', 50)) / 1000
+MAX_BATCH_SIZE = int(os.environ.get('COVER_LETTER_MAX_BATCH', 5))
+# A letter shorter than this almost certainly means the reply was mangled.
+MIN_LETTER_CHARS = 200
+
+MARKER_RE = re.compile(r'^\s*=+\s*COVER LETTER\s+(\d+)\s*=+\s*$', re.MULTILINE | re.IGNORECASE)
+
+
+def parse_batch_reply(reply: str, count: int) -> List[Optional[str]]:
+    letters: List[Optional[str]] = [None] * count
+    markers = list(MARKER_RE.finditer(reply))
+    for marker, following in zip(markers, markers[1:] + [None]):
+        index = int(marker.group(1)) - 1
+        end = following.start() if following else len(reply)
+        letter = reply[marker.end():end].strip()
+        if 0 <= index < count and len(letter) >= MIN_LETTER_CHARS:
+            letters[index] = letter
+    return letters
+
+
+@dataclass
+class _Pending:
+    profile: dict
+    job: dict
+    future: asyncio.Future
+
+
+class CoverLetterBatcher:
+    def __init__(self, send: Callable[[str, BuiltPrompt], Awaitable[str]],
+                 window: float = BATCH_WINDOW_SECONDS, max_batch: int = MAX_BATCH_SIZE):
+        self.send = send
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[str, List[_Pending]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks = set()
+
+    def _enqueue(self, user_id: str, profile: dict, job: dict) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(user_id, []).append(_Pending(profile, job, future))
+        return future
+
+    async def request(self, user_id: str, profile: dict, job: dict) -> str:
+        future = self._enqueue(user_id, profile, job)
+        if len(self._pending[user_id]) >= self.max_batch:
+            self._flush(user_id)
+        elif user_id not in self._timers:
+            self._timers[user_id] = asyncio.get_running_loop().call_later(self.window, self._flush, user_id)
+        return await future
+
+    async def request_many(self, user_id: str, profile: dict, jobs: List[dict]) -> List[str]:
+        futures = [self._enqueue(user_id, profile, job) for job in jobs]
+        self._flush(user_id)
+        return list(await asyncio.gather(*futures))
+
+    def _flush(self, user_id: str):
+        timer = self._timers.pop(user_id, None)
+        if timer:
+            timer.cancel()
+        pending = self._pending.pop(user_id, [])
+        for start in range(0, len(pending), self.max_batch):
+            task = asyncio.create_task(self._run(pending[start:start + self.max_batch]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[_Pending]):
+        try:
+            letters = await self._generate(batch)
+        except Exception as exc:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            return
+        for item, letter in zip(batch, letters):
+            if not item.future.done():
+                item.future.set_result(letter)
+
+    async def _generate(self, batch: List[_Pending]) -> List[str]:
+        metrics.observe('cover_letter.batch_size', len(batch))
+        if len(batch) == 1:
+            return [await self._single(batch[0])]
+
+        # Every entry belongs to the same user; the newest profile wins.
+        profile = batch[-1].profile
+        reply = await self.send('cover_letter_batch', build_batch_cover_letter_prompt([item.job for item in batch], profile))
+        letters = parse_batch_reply(reply, len(batch))
+        missing = [i for i, letter in enumerate(letters) if letter is None]
+        if missing:
+            logger.warning(f'Batched cover letter reply missing {len(missing)}/{len(batch)} letters; falling back to single calls')
+            metrics.observe('cover_letter.batch_fallbacks', len(missing))
+            fallbacks = await asyncio.gather(*(self._single(batch[i]) for i in missing))
+            for i, letter in zip(missing, fallbacks):
+                letters[i] = letter
+        return letters
+
+    async def _single(self, item: _Pending) -> str:
+        return await self.send('cover_letter', build_cover_letter_prompt(item.job, item.profile))
@@ -0,0 +1,119 @@
+"""Streaming exports of application history.
+
+Rows are pulled from a Mongo cursor in batches and written out as NDJSON or
+CSV chunks of ``EXPORT_BATCH_SIZE`` rows, so memory stays flat no matter how
+long the history is.
+"""
+import csv
+import io
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = (
+    'id', 'user_id', 'job_id', 'job_title', 'company', 'status',
+    'resume_id', 'cover_letter', 'applied_at', 'updated_at',
+)
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def export_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return list(EXPORT_FIELDS)
+    selected = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in selected if field not in EXPORT_FIELDS]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown export fields: {', '.join(unknown)}. Choose from: {', '.join(EXPORT_FIELDS)}"
+        )
+    return list(dict.fromkeys(selected))
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Dates are stored in UTC; a bound without an offset is read as UTC too.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def applied_between(start: Optional[datetime], end: Optional[datetime]) -> Dict[str, dict]:
+    start, end = _as_utc(start), _as_utc(end)
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail='start must not be after end')
+    bounds = {}
+    if start:
+        bounds['$gte'] = start
+    if end:
+        bounds['$lt'] = end
+    return {'applied_at': bounds} if bounds else {}
+
+
+def projection(fields: Sequence[str]) -> dict:
+    return {'_id': 0, **{field: 1 for field in fields}}
+
+
+async def ndjson_chunks(cursor, fields: Sequence[str], batch_rows: int = EXPORT_BATCH_SIZE) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    rows = 0
+    async for doc in cursor:
+        buffer += orjson.dumps({field: doc.get(field) for field in fields}, option=orjson.OPT_APPEND_NEWLINE)
+        rows += 1
+        if rows == batch_rows:
+            yield bytes(buffer)
+            buffer.clear()
+            rows = 0
+    if buffer:
+        yield bytes(buffer)
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def csv_chunks(cursor, fields: Sequence[str], batch_rows: int = EXPORT_BATCH_SIZE) -> AsyncIterator[bytes]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(fields)
+    rows = 0
+    async for doc in cursor:
+        writer.writerow([_csv_value(doc.get(field)) for field in fields])
+        rows += 1
+        if rows == batch_rows:
+            yield out.getvalue().encode()
+            out.seek(0)
+            out.truncate()
+            rows = 0
+    yield out.getvalue().encode()
+
+
+async def _closing(cursor, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # The client may disconnect mid-export; release the server-side cursor either way.
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await cursor.close()
+
+
+def export_response(cursor, format: str, fields: Sequence[str], filename: str) -> StreamingResponse:
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format. Choose from: {', '.join(EXPORT_FORMATS)}")
+    cursor = cursor.batch_size(EXPORT_BATCH_SIZE)
+    chunks = ndjson_chunks(cursor, fields) if format == 'ndjson' else csv_chunks(cursor, fields)
+    return StreamingResponse(
+        _closing(cursor, chunks),
+        media_type=EXPORT_FORMATS[format],
+        headers={'Content-Disposition': f'attachment; filename={filename}.{format}'}
+    )
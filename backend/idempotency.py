@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+from datetime import datetime, timezone, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+
+def fingerprint(payload) -> str:
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _stored_response(stored) -> dict:
+    # Markers written before responses were stored as JSON hold a plain document.
+    return orjson.loads(stored) if isinstance(stored, bytes) else stored
+
+
+class IdempotencyStore:
+    """Runs each (scope, Idempotency-Key) at most once and replays the stored response.
+
+    The first request inserts an in-progress marker; duplicates that arrive
+    while it runs wait for it to finish instead of repeating the work. A
+    marker whose lease expires (the owning worker died) can be taken over.
+    Failed requests remove their marker so the client can retry.
+    """
+
+    def __init__(self, collection, ttl: timedelta = timedelta(hours=24),
+                 lease: timedelta = timedelta(minutes=5), max_wait: float = 120):
+        self.collection = collection
+        self.ttl = ttl
+        self.lease = lease
+        self.max_wait = max_wait
+        self._running: Dict[str, asyncio.Event] = {}
+
+    async def ensure_indexes(self):
+        await self.collection.create_index('expires_at', expireAfterSeconds=0)
+
+    async def run(self, scope: str, key: str, request_fingerprint: str,
+                  fn: Callable[[], Awaitable[dict]]) -> Tuple[dict, bool]:
+        """Return ``(response, replayed)``."""
+        doc_id = f'{scope}:{key}'
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        delay = 0.1
+
+        while True:
+            if await self._claim(doc_id, request_fingerprint):
+                return await self._execute(doc_id, fn), False
+
+            doc = await self.collection.find_one({'_id': doc_id})
+            if doc is None:
+                continue
+            if doc['fingerprint'] != request_fingerprint:
+                raise HTTPException(status_code=422, detail='Idempotency-Key was already used with a different request')
+            if doc['state'] == 'completed':
+                return _stored_response(doc['response']), True
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise HTTPException(
+                    status_code=409,
+                    detail='A request with this Idempotency-Key is still in progress',
+                    headers={'Retry-After': '5'}
+                )
+            await self._wait(doc_id, min(delay, remaining))
+            delay = min(delay * 2, 2)
+
+    async def _claim(self, doc_id: str, request_fingerprint: str) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            await self.collection.insert_one({
+                '_id': doc_id,
+                'state': 'in_progress',
+                'fingerprint': request_fingerprint,
+                'locked_until': now + self.lease,
+                'expires_at': now + self.ttl,
+            })
+            return True
+        except DuplicateKeyError:
+            pass
+        stale = await self.collection.find_one_and_update(
+            {'_id': doc_id, 'state': 'in_progress', 'fingerprint': request_fingerprint, 'locked_until': {'$lt': now}},
+            {'$set': {'locked_until': now + self.lease}},
+            return_document=ReturnDocument.AFTER
+        )
+        return stale is not None
+
+    async def _execute(self, doc_id: str, fn: Callable[[], Awaitable[dict]]) -> dict:
+        event = asyncio.Event()
+        self._running[doc_id] = event
+        try:
+            response = await fn()
+            # Stored as JSON rather than BSON so replays are byte-identical;
+            # BSON dates would drop the microseconds of e.g. created_at.
+            await self.collection.update_one(
+                {'_id': doc_id},
+                {'$set': {'state': 'completed', 'response': orjson.dumps(response)}, '$unset': {'locked_until': ''}}
+            )
+            return response
+        except BaseException:
+            await self.collection.delete_one({'_id': doc_id, 'state': 'in_progress'})
+            raise
+        finally:
+            del self._running[doc_id]
+            event.set()
+
+    async def _wait(self, doc_id: str, timeout: float):
+        # Duplicates on the same worker wake as soon as the owner finishes;
+        # duplicates on other workers poll with backoff.
+        event: Optional[asyncio.Event] = self._running.get(doc_id)
+        if event is None:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
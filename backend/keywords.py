@@ -0,0 +1,157 @@
+"""Local job-description keyword extraction.
+
+Scores 1-3 word candidate phrases by TF-IDF against the job corpus and boosts
+phrases found in a curated skills dictionary, replacing the LLM round trip
+that used to produce the resume keywords. Runs in well under a millisecond
+per description once the document frequencies are built.
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TOP_K = 10
+MAX_NGRAM = 3
+SKILL_BOOST = 3.0
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]')
+# Phrases never span punctuation: "React, Node.js" is two candidates, not one.
+CLAUSE_RE = re.compile(r'[,;:()!?\n]|\.(?:\s|$)')
+
+STOPWORDS = frozenset('''
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either etc every few for from
+further had has have having he her here hers him his how i if in into is it its itself just like
+looking make may me more most must my need needed needs no nor not of off on once only or other our ours
+out over own per plus preferred required requirements role same seeking she should so some such than
+that the their theirs them then there these they this those through to too under until up us using
+very via want was we were what when where which while who whom why will with within without work
+working would you your years year experience experienced strong ability able team join looking new
+including excellent good great knowledge understanding skills skill proficient proficiency expertise
+candidate candidates position opportunity responsibilities build building help company essential
+'''.split())
+
+# Canonical display name -> aliases (lowercase) that should map onto it.
+SKILLS: Dict[str, Tuple[str, ...]] = {
+    'Python': ('python',), 'Java': ('java',), 'JavaScript': ('javascript', 'js'), 'TypeScript': ('typescript', 'ts'),
+    'Go': ('golang',), 'Rust': ('rust',), 'C++': ('c++', 'cpp'), 'C#': ('c#', 'csharp'), 'Ruby': ('ruby',),
+    'PHP': ('php',), 'Kotlin': ('kotlin',), 'Swift': ('swift',), 'Scala': ('scala',), 'R': ('r',),
+    'SQL': ('sql',), 'NoSQL': ('nosql',), 'PostgreSQL': ('postgresql', 'postgres'), 'MySQL': ('mysql',),
+    'MongoDB': ('mongodb', 'mongo'), 'Redis': ('redis',), 'Elasticsearch': ('elasticsearch',),
+    'React': ('react', 'react.js', 'reactjs'), 'Angular': ('angular',), 'Vue': ('vue', 'vue.js'),
+    'Node.js': ('node.js', 'nodejs', 'node'), 'Next.js': ('next.js', 'nextjs'), 'Django': ('django',),
+    'Flask': ('flask',), 'FastAPI': ('fastapi',), 'Spring': ('spring', 'spring boot'), 'GraphQL': ('graphql',),
+    'REST APIs': ('rest', 'rest api', 'rest apis', 'restful', 'restful apis'), 'Microservices': ('microservices',),
+    'HTML': ('html', 'html5'), 'CSS': ('css', 'css3', 'modern css'), 'Tailwind CSS': ('tailwind', 'tailwind css'),
+    'Figma': ('figma',), 'Responsive Design': ('responsive design',), 'User Interfaces': ('user interfaces', 'ui'),
+    'AWS': ('aws', 'amazon web services'), 'GCP': ('gcp', 'google cloud'), 'Azure': ('azure',),
+    'Docker': ('docker',), 'Kubernetes': ('kubernetes', 'k8s'), 'Terraform': ('terraform',),
+    'CI/CD': ('ci/cd', 'continuous integration', 'continuous delivery'), 'Linux': ('linux',), 'Git': ('git',),
+    'Cloud Infrastructure': ('cloud infrastructure',), 'DevOps': ('devops',), 'Kafka': ('kafka',),
+    'Spark': ('spark', 'apache spark'), 'Airflow': ('airflow',),
+    'Machine Learning': ('machine learning', 'ml'), 'Deep Learning': ('deep learning',), 'AI': ('ai',),
+    'TensorFlow': ('tensorflow',), 'PyTorch': ('pytorch',), 'scikit-learn': ('scikit-learn', 'sklearn'),
+    'NLP': ('nlp', 'natural language processing'), 'LLMs': ('llm', 'llms', 'large language models'),
+    'Statistics': ('statistics', 'statistical'), 'Data Visualization': ('data visualization',),
+    'Data Processing': ('data processing', 'large-scale data processing'), 'Predictive Models': ('predictive models', 'predictive modeling'),
+    'Pandas': ('pandas',), 'NumPy': ('numpy',), 'Tableau': ('tableau',), 'Excel': ('excel',),
+    'Full Stack': ('full stack', 'full-stack'), 'Frontend': ('frontend', 'front-end'), 'Backend': ('backend', 'back-end'),
+    'Scalable APIs': ('scalable apis',), 'Agile': ('agile', 'scrum'), 'Testing': ('testing', 'unit testing'),
+}
+
+_ALIASES = {alias: canonical for canonical, aliases in SKILLS.items() for alias in aliases}
+# Aliases too common as plain words to trust on their own ("go", "rust", "spring").
+_AMBIGUOUS = frozenset({'r', 'go', 'ts', 'js', 'spring', 'swift', 'rust'})
+
+
+def clauses(text: str) -> List[List[str]]:
+    return [tokens for tokens in (TOKEN_RE.findall(part) for part in CLAUSE_RE.split(text.lower())) if tokens]
+
+
+def candidates(text: str) -> Iterable[str]:
+    for tokens in clauses(text):
+        for n in range(1, MAX_NGRAM + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = tokens[i:i + n]
+                if gram[0] in STOPWORDS or gram[-1] in STOPWORDS:
+                    continue
+                if n == 1 and gram[0].isdigit():
+                    continue
+                yield ' '.join(gram)
+
+
+def _canonical(phrase: str) -> Optional[str]:
+    canonical = _ALIASES.get(phrase)
+    if canonical is None:
+        canonical = _ALIASES.get(phrase.rstrip('.'))
+    return canonical
+
+
+class KeywordExtractor:
+    def __init__(self, corpus: Iterable[str] = ()):
+        self.documents = 0
+        self.df: Counter = Counter()
+        for text in corpus:
+            self.add_document(text)
+
+    @classmethod
+    def from_frequencies(cls, documents: int, df) -> 'KeywordExtractor':
+        """Use precomputed document frequencies; ``df`` only needs ``get(phrase, default)``."""
+        extractor = cls()
+        extractor.documents = documents
+        extractor.df = df
+        return extractor
+
+    def add_document(self, text: str):
+        self.documents += 1
+        self.df.update(set(candidates(text)))
+
+    def idf(self, phrase: str) -> float:
+        return math.log((1 + self.documents) / (1 + self.df.get(phrase, 0))) + 1
+
+    def extract(self, text: str, top_k: int = TOP_K) -> List[str]:
+        counts = Counter(candidates(text))
+        scored: Dict[str, float] = {}
+        display: Dict[str, str] = {}
+        known = set()
+
+        for phrase, tf in counts.items():
+            if phrase in _AMBIGUOUS:
+                continue
+            canonical = _canonical(phrase)
+            if canonical is None and len(phrase) < 3:
+                continue
+            score = (1 + math.log(tf)) * self.idf(phrase)
+            words = phrase.count(' ') + 1
+            if canonical is not None:
+                score *= SKILL_BOOST
+                key = canonical.lower()
+                name = canonical
+                known.add(key)
+            else:
+                # Outside the skills dictionary, only repeated phrases are trusted.
+                if tf < 2:
+                    continue
+                key = phrase
+                name = phrase.title() if words > 1 else phrase.capitalize()
+            if score > scored.get(key, 0):
+                scored[key] = score
+                display[key] = name
+
+        ranked = sorted(scored, key=lambda k: (-scored[k], k))
+        keywords: List[str] = []
+        chosen_words = set()
+        for key in ranked:
+            # Free-text phrases that only restate chosen words add nothing,
+            # e.g. 'stack developer' after 'full stack'.
+            if key not in known and set(key.split(' ')) & chosen_words:
+                continue
+            chosen_words.update(key.split(' '))
+            keywords.append(display[key])
+            if len(keywords) == top_k:
+                break
+        return keywords
+
+
+def job_text(job: dict) -> str:
+    return ' '.join([job.get('title', ''), job.get('description', ''), ' '.join(job.get('requirements', []))])
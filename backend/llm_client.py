@@ -0,0 +1,291 @@
+"""Shared LLM client with deadlines, jittered retries, a circuit breaker and hedging.
+
+Every prompt goes through one ``LlmClient`` instead of an ad-hoc
+``LlmChat(...).with_model(...)``. An attempt that runs past the recent p95
+latency gets a hedged duplicate, and whichever answers first wins. Failed
+attempts are retried with jittered exponential backoff inside an overall
+deadline. Repeated failures open the breaker so requests fail fast with 503
+instead of queueing behind a dead provider. ``CallLimiter`` bounds how many
+provider calls (hedges included) this worker has in flight at once.
+
+The backend is any ``async (session_id, system_message, text) -> str``
+callable. ``FakeLlmBackend`` has injectable latency and faults for tests,
+benchmarks and local development (``LLM_BACKEND=fake``).
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional
+
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, stop_after_delay, wait_random_exponential
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+Backend = Callable[[str, str, str], Awaitable[str]]
+
+
+class LlmUnavailable(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__('LLM provider unavailable')
+        self.retry_after = retry_after
+
+
+@lru_cache(maxsize=None)
+def emergent_classes():
+    # litellm and the provider SDKs are slow to import; see the startup warmup.
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+    return LlmChat, UserMessage
+
+
+class EmergentLlmBackend:
+    """Sends one prompt per fresh chat session.
+
+    LlmChat keeps per-session history, so instances cannot be shared between
+    prompts; HTTP connections are pooled by litellm's process-wide client
+    cache underneath.
+    """
+
+    def __init__(self, provider: str, model: str, api_key: Optional[str]):
+        self.provider = provider
+        self.model = model
+        self.api_key = api_key
+
+    async def __call__(self, session_id: str, system_message: str, text: str) -> str:
+        LlmChat, UserMessage = emergent_classes()
+        chat = LlmChat(
+            api_key=self.api_key,
+            session_id=session_id,
+            system_message=system_message
+        ).with_model(self.provider, self.model)
+        return await chat.send_message(UserMessage(text=text))
+
+
+class FakeLlmBackend:
+    """Local stand-in with a configurable latency distribution and fault rates."""
+
+    def __init__(self, latency: Callable[[], float] = lambda: 0.05, fault_rate: float = 0.0,
+                 reply: Callable[[str], str] = lambda text: f'Fake reply to: {text[:80]}', seed: Optional[int] = None):
+        self.latency = latency
+        self.fault_rate = fault_rate
+        self.reply = reply
+        self.calls = 0
+        self.in_flight = 0
+        self._rng = random.Random(seed)
+
+    async def __call__(self, session_id: str, system_message: str, text: str) -> str:
+        self.calls += 1
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(self.latency())
+        finally:
+            self.in_flight -= 1
+        if self._rng.random() < self.fault_rate:
+            raise ConnectionError('injected fault')
+        return self.reply(text)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    def before_call(self) -> bool:
+        """Raise ``LlmUnavailable`` while open; return True for the half-open trial call."""
+        if self.opened_at is None:
+            return False
+        waited = time.monotonic() - self.opened_at
+        if waited < self.reset_timeout or self._trial_running:
+            raise LlmUnavailable(max(1.0, self.reset_timeout - waited))
+        # Half-open: let a single trial call through.
+        self._trial_running = True
+        return True
+
+    def release_trial(self):
+        # A cancelled trial proves nothing either way; let the next call retry it.
+        self._trial_running = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._trial_running:
+                logger.warning(f'LLM circuit breaker opened after {self.failures} consecutive failures')
+            self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class CallLimiter:
+    """Bounds concurrent provider calls across every request in this worker.
+
+    Calls beyond ``max_inflight`` wait their turn. Once ``max_queued`` calls
+    are waiting the limiter reports itself saturated, which admission control
+    uses to turn away new generations instead of growing the queue.
+    """
+
+    def __init__(self, max_inflight: int = 32, max_queued: int = 64):
+        self.max_inflight = max_inflight
+        self.max_queued = max_queued
+        self.inflight = 0
+        self.queued = 0
+        self._semaphore = asyncio.Semaphore(max_inflight)
+
+    @property
+    def saturated(self) -> bool:
+        return self.queued >= self.max_queued
+
+    @property
+    def idle_slot(self) -> bool:
+        return self.queued == 0 and self.inflight < self.max_inflight
+
+    @asynccontextmanager
+    async def slot(self):
+        started = time.perf_counter()
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        metrics.observe('llm.queue_ms', (time.perf_counter() - started) * 1000)
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+            self._semaphore.release()
+
+
+class LatencyWindow:
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if len(self.samples) < 20:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _retryable(exc: BaseException) -> bool:
+    return not isinstance(exc, LlmUnavailable)
+
+
+class LlmClient:
+    def __init__(self, backend: Backend, attempt_timeout: float = 45, deadline: float = 120, attempts: int = 3,
+                 hedge: bool = True, hedge_floor: float = 0.5, breaker: Optional[CircuitBreaker] = None,
+                 backoff_max: float = 8, calls: Optional[CallLimiter] = None):
+        self.backend = backend
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.attempts = attempts
+        self.hedge = hedge
+        self.hedge_floor = hedge_floor
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.calls = calls or CallLimiter()
+        self.latencies = LatencyWindow()
+
+    @classmethod
+    def from_env(cls, provider: str, model: str):
+        if os.environ.get('LLM_BACKEND') == 'fake':
+            backend = FakeLlmBackend(latency=lambda: random.uniform(0.2, 1.0))
+        else:
+            backend = EmergentLlmBackend(provider, model, os.environ.get('EMERGENT_LLM_KEY'))
+        return cls(
+            backend,
+            attempt_timeout=float(os.environ.get('LLM_ATTEMPT_TIMEOUT_SECONDS', 45)),
+            deadline=float(os.environ.get('LLM_DEADLINE_SECONDS', 120)),
+            attempts=int(os.environ.get('LLM_MAX_ATTEMPTS', 3)),
+            hedge=os.environ.get('LLM_HEDGE', '1') == '1',
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.environ.get('LLM_BREAKER_FAILURES', 5)),
+                reset_timeout=float(os.environ.get('LLM_BREAKER_RESET_SECONDS', 30))
+            ),
+            calls=CallLimiter(
+                max_inflight=int(os.environ.get('LLM_MAX_INFLIGHT', 32)),
+                max_queued=int(os.environ.get('LLM_MAX_QUEUED', 64))
+            )
+        )
+
+    async def complete(self, session_id: str, system_message: str, text: str) -> str:
+        return await asyncio.wait_for(self._with_retries(session_id, system_message, text), self.deadline)
+
+    async def _with_retries(self, session_id: str, system_message: str, text: str) -> str:
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.attempts) | stop_after_delay(self.deadline),
+            wait=wait_random_exponential(multiplier=0.5, max=self.backoff_max),
+            retry=retry_if_exception(_retryable),
+            reraise=True
+        )
+        async for attempt in retrying:
+            with attempt:
+                if attempt.retry_state.attempt_number > 1:
+                    metrics.observe('llm.retries', 1)
+                return await self._hedged(f'{session_id}_{attempt.retry_state.attempt_number}', system_message, text)
+
+    async def _attempt(self, session_id: str, system_message: str, text: str) -> str:
+        trial = self.breaker.before_call()
+        try:
+            async with self.calls.slot():
+                started = time.monotonic()
+                result = await asyncio.wait_for(self.backend(session_id, system_message, text), self.attempt_timeout)
+        except asyncio.CancelledError:
+            if trial:
+                self.breaker.release_trial()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        self.latencies.add(time.monotonic() - started)
+        return result
+
+    async def _hedged(self, session_id: str, system_message: str, text: str) -> str:
+        p95 = self.latencies.percentile(95) if self.hedge else None
+        if p95 is None:
+            return await self._attempt(session_id, system_message, text)
+
+        primary = asyncio.ensure_future(self._attempt(session_id, system_message, text))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=max(p95, self.hedge_floor))
+            if done:
+                return primary.result()
+            if not self.calls.idle_slot:
+                # A hedge must not take a slot another request is waiting for.
+                return await primary
+
+            metrics.observe('llm.hedges', 1)
+            tasks.append(asyncio.ensure_future(self._attempt(f'{session_id}_hedge', system_message, text)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Also runs when the caller's deadline cancels us mid-wait: no backend call may outlive it.
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
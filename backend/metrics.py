@@ -0,0 +1,56 @@
+import random
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+RESERVOIR_SIZE = 2048
+
+
+class Distribution:
+    """Count, sum and a fixed-size reservoir sample for percentile estimates."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = float('-inf')
+        self.samples: List[float] = []
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(value)
+        else:
+            slot = random.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = value
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+
+        def pct(p):
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] if ordered else None
+
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': pct(50),
+            'p95': pct(95),
+            'p99': pct(99),
+            'max': self.max if self.count else None,
+        }
+
+
+_lock = threading.Lock()
+_distributions: Dict[str, Distribution] = defaultdict(Distribution)
+
+
+def observe(name: str, value: float):
+    with _lock:
+        _distributions[name].add(value)
+
+
+def snapshot() -> Dict[str, dict]:
+    with _lock:
+        return {name: dist.summary() for name, dist in sorted(_distributions.items())}
@@ -0,0 +1,48 @@
+"""Convert legacy ISO-8601 string timestamps into native BSON dates.
+
+Earlier versions stored created_at/applied_at/updated_at as isoformat()
+strings. The migration is idempotent: it only touches documents whose field
+is still a string, so it can be re-run safely.
+
+    python migrate_dates.py
+"""
+import asyncio
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+DATE_FIELDS = {
+    'users': ['created_at'],
+    'profiles': ['updated_at'],
+    'resumes': ['created_at'],
+    'applications': ['applied_at', 'updated_at'],
+}
+
+
+async def migrate_string_dates(db) -> dict:
+    converted = {}
+    for collection, fields in DATE_FIELDS.items():
+        for field in fields:
+            result = await db[collection].update_many(
+                {field: {'$type': 'string'}},
+                [{'$set': {field: {'$toDate': f'${field}'}}}]
+            )
+            converted[f'{collection}.{field}'] = result.modified_count
+    return converted
+
+
+async def main():
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        converted = await migrate_string_dates(client[os.environ['DB_NAME']])
+        for field, count in converted.items():
+            print(f'{field}: {count} documents converted')
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+import cProfile
+import contextvars
+import io
+import pstats
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from pymongo import monitoring
+
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+_active_profile: contextvars.ContextVar[Optional['RequestProfile']] = contextvars.ContextVar(
+    'active_profile', default=None
+)
+# sys.setprofile is per-thread, so only one request at a time can own cProfile.
+# Concurrent profiled requests still record their await spans.
+_cprofile_owner: Optional['RequestProfile'] = None
+_requests_in_flight = 0
+
+
+class RequestProfile:
+    def __init__(self, method: str, path: str):
+        self.id = str(uuid.uuid4())
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.ended: Optional[float] = None
+        self.spans: List[Tuple[str, float, float]] = []
+        self.cprofile: Optional[cProfile.Profile] = None
+        # cProfile runs on the event-loop thread, so it also times whatever
+        # other requests the loop serves meanwhile.
+        self.overlapping_requests = 0
+
+    def add_span(self, name: str, start: float, end: float):
+        self.spans.append((name, start - self.started, end - self.started))
+
+    def start(self):
+        global _cprofile_owner
+        if _cprofile_owner is None:
+            _cprofile_owner = self
+            self.overlapping_requests = _requests_in_flight - 1
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def stop(self):
+        global _cprofile_owner
+        self.ended = time.perf_counter()
+        if self.cprofile and _cprofile_owner is self:
+            self.cprofile.disable()
+            _cprofile_owner = None
+
+    @property
+    def duration(self) -> float:
+        return (self.ended or time.perf_counter()) - self.started
+
+    def cprofile_text(self, limit: int = 40) -> str:
+        if not self.cprofile:
+            return 'cProfile unavailable: another profiled request held the profiler'
+        out = io.StringIO()
+        out.write(
+            f'cProfile ran on the event-loop thread and includes the work of {self.overlapping_requests} '
+            'other request(s) that overlapped this one; use the speedscope spans for this request alone.\n\n'
+        )
+        pstats.Stats(self.cprofile, stream=out).sort_stats('cumulative').print_stats(limit)
+        return out.getvalue()
+
+    def to_speedscope(self) -> dict:
+        """Export await spans as evented speedscope profiles, one lane per set of non-overlapping spans."""
+        request_name = f'{self.method} {self.path}'
+        frames = [{'name': request_name}]
+        frame_index = {request_name: 0}
+        lanes: List[List[Tuple[int, float, float]]] = []
+
+        for name, start, end in sorted(self.spans, key=lambda s: s[1]):
+            if name not in frame_index:
+                frame_index[name] = len(frames)
+                frames.append({'name': name})
+            lane = next((l for l in lanes if l[-1][2] <= start), None)
+            if lane is None:
+                lane = []
+                lanes.append(lane)
+            lane.append((frame_index[name], start, end))
+
+        end_ms = self.duration * 1000
+        profiles = []
+        for i, lane in enumerate(lanes or [[]]):
+            events = [{'type': 'O', 'frame': 0, 'at': 0}]
+            for frame, start, end in lane:
+                events.append({'type': 'O', 'frame': frame, 'at': start * 1000})
+                events.append({'type': 'C', 'frame': frame, 'at': min(end * 1000, end_ms)})
+            events.append({'type': 'C', 'frame': 0, 'at': end_ms})
+            profiles.append({
+                'type': 'evented',
+                'name': f'{request_name} (lane {i})',
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': end_ms,
+                'events': events,
+            })
+
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': request_name,
+            'exporter': 'autoapply-profiler',
+            'shared': {'frames': frames},
+            'profiles': profiles,
+        }
+
+    def to_document(self) -> dict:
+        return {
+            'id': self.id,
+            'method': self.method,
+            'path': self.path,
+            'duration_ms': round(self.duration * 1000, 3),
+            'created_at': datetime.now(timezone.utc),
+            'speedscope': self.to_speedscope(),
+            'cprofile': self.cprofile_text(),
+            'overlapping_requests': self.overlapping_requests,
+        }
+
+
+@contextmanager
+def request_running():
+    """Count a request as in flight, so a profile can report what overlapped it."""
+    global _requests_in_flight
+    _requests_in_flight += 1
+    if _cprofile_owner is not None:
+        _cprofile_owner.overlapping_requests += 1
+    try:
+        yield
+    finally:
+        _requests_in_flight -= 1
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _active_profile.get()
+
+
+def activate(profile: RequestProfile):
+    return _active_profile.set(profile)
+
+
+def deactivate(token):
+    _active_profile.reset(token)
+
+
+@asynccontextmanager
+async def profile_span(name: str):
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_span(name, start, time.perf_counter())
+
+
+class MongoCommandProfiler(monitoring.CommandListener):
+    """Records Mongo round trips as spans on the active request profile.
+
+    Motor copies the calling context into its executor threads, so the
+    listener sees the same context variable as the request handler.
+    """
+
+    def __init__(self):
+        self._pending = {}
+
+    def started(self, event):
+        profile = _active_profile.get()
+        if profile is not None:
+            self._pending[(event.connection_id, event.request_id)] = (profile, time.perf_counter())
+
+    def _finish(self, event):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending:
+            profile, start = pending
+            profile.add_span(f'mongo.{event.command_name}', start, time.perf_counter())
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
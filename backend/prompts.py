@@ -0,0 +1,439 @@
+"""Prompt builders with tiktoken-based token budgets.
+
+Profiles can carry any number of education, experience and project entries,
+and job descriptions are pasted in verbatim, so prompts are assembled here
+under an explicit budget: the job description is capped, profile entries are
+ranked by word overlap with the job and the least relevant are dropped first.
+"""
+import logging
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, List, Set
+
+from keywords import STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+RESUME_PROMPT_BUDGET = int(os.environ.get('RESUME_PROMPT_TOKEN_BUDGET', 3000))
+COVER_LETTER_PROMPT_BUDGET = int(os.environ.get('COVER_LETTER_PROMPT_TOKEN_BUDGET', 1500))
+# Share of a prompt's budget the job description may take before it is truncated.
+JOB_DESCRIPTION_SHARE = 0.35
+# No single profile entry may crowd out the rest.
+MAX_ENTRY_TOKENS = 200
+# Names, contact details and job titles are one-liners; anything longer is pasted junk.
+MAX_FIELD_TOKENS = 40
+
+WORD_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+
+@lru_cache(maxsize=None)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(os.environ.get('TIKTOKEN_ENCODING', 'cl100k_base'))
+    except Exception:
+        # tiktoken downloads its BPE files on first use; without network access
+        # fall back to the usual ~4 characters per token estimate.
+        logger.warning('tiktoken encoding unavailable; estimating tokens from length')
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, limit: int) -> str:
+    encoding = _encoding()
+    if encoding is None:
+        return text if len(text) <= limit * 4 else text[:limit * 4].rstrip() + '...'
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= limit:
+        return text
+    return encoding.decode(tokens[:limit]).rstrip() + '...'
+
+
+def words(text: str) -> Set[str]:
+    return set(WORD_RE.findall(text.lower()))
+
+
+@dataclass
+class BuiltPrompt:
+    text: str
+    tokens: int
+    budget: int
+    dropped_entries: int = 0
+    truncated: List[str] = field(default_factory=list)
+
+
+@dataclass
+class _Entry:
+    section: str
+    position: int
+    line: str
+    tokens: int
+    relevance: int
+
+
+def _section_entries(section: str, items: List[dict], fmt: Callable[[dict], str], job_words: Set[str]) -> List[_Entry]:
+    entries = []
+    for position, item in enumerate(items):
+        line = truncate_tokens(fmt(item), MAX_ENTRY_TOKENS)
+        entries.append(_Entry(section, position, line, count_tokens(line) + 1, len(words(line) & job_words)))
+    return entries
+
+
+def _fmt_education(edu: dict) -> str:
+    return f"- {edu.get('degree', '')} in {edu.get('field', '')} from {edu.get('institution', '')} ({edu.get('year', '')})"
+
+
+def _fmt_experience(exp: dict) -> str:
+    return f"- {exp.get('title', '')} at {exp.get('company', '')} ({exp.get('duration', '')}): {exp.get('description', '')}"
+
+
+def _fmt_project(proj: dict) -> str:
+    return f"- {proj.get('name', '')}: {proj.get('description', '')}"
+
+
+def _render_resume_prompt(profile: dict, job_title: str, job_description: str, skills: List[str],
+                          sections: dict) -> str:
+    profile_summary = f"""
+Name: {profile.get('name', '')}
+Email: {profile.get('email', '')}
+Phone: {profile.get('phone', 'N/A')}
+Location: {profile.get('location', 'N/A')}
+Summary: {profile.get('summary', 'N/A')}
+
+Skills: {", ".join(skills)}
+
+Education:
+{chr(10).join(sections['education'])}
+
+Experience:
+{chr(10).join(sections['experience'])}
+
+Projects:
+{chr(10).join(sections['projects'])}
+"""
+
+    return f"""Create an ATS-friendly resume for the following job:
+
+Job Title: {job_title}
+Job Description: {job_description}
+
+Candidate Profile:
+{profile_summary}
+
+IMPORTANT REQUIREMENTS:
+1. Use a single-column layout (no tables)
+2. Extract and incorporate relevant keywords from the job description
+3. Optimize bullet points to match job requirements
+4. Keep formatting simple and ATS-scannable
+5. Highlight relevant skills and experience
+6. Return ONLY the resume content in plain text format, well-structured with clear sections
+7. Include these sections: Contact Info, Professional Summary, Skills, Experience, Education, Projects
+8. Do not include any images or complex formatting
+
+Generate the ATS-optimized resume now:"""
+
+
+def build_resume_prompt(profile: dict, job_title: str, job_description: str,
+                        budget: int = RESUME_PROMPT_BUDGET) -> BuiltPrompt:
+    truncated = []
+    job_words = words(f'{job_title} {job_description}')
+    capped_title = truncate_tokens(job_title, MAX_FIELD_TOKENS)
+    capped_profile = {
+        name: truncate_tokens(str(profile.get(name) or default), MAX_FIELD_TOKENS)
+        for name, default in (('name', ''), ('email', ''), ('phone', 'N/A'), ('location', 'N/A'))
+    }
+    capped_profile['summary'] = truncate_tokens(profile.get('summary') or 'N/A', MAX_ENTRY_TOKENS)
+    if capped_title != job_title:
+        truncated.append('job_title')
+    if capped_profile['summary'] != (profile.get('summary') or 'N/A'):
+        truncated.append('summary')
+
+    def render(description: str, skills: List[str], sections: dict) -> str:
+        return _render_resume_prompt(capped_profile, capped_title, description, skills, sections)
+
+    capped_description = truncate_tokens(job_description, int(budget * JOB_DESCRIPTION_SHARE))
+    empty_sections = {'education': [], 'experience': [], 'projects': []}
+    fixed_tokens = count_tokens(render(capped_description, [], empty_sections))
+    # Only very small budgets get here: the job description, then the summary,
+    # give up whatever the fixed part overruns. The instructions and contact
+    # lines themselves are never cut.
+    while fixed_tokens > budget and (capped_description or capped_profile['summary']):
+        field_name = 'description' if capped_description else 'summary'
+        value = capped_description if capped_description else capped_profile['summary']
+        limit = count_tokens(value) - (fixed_tokens - budget) - 2
+        value = truncate_tokens(value, limit) if limit > 0 else ''
+        if field_name == 'description':
+            capped_description = value
+        else:
+            capped_profile['summary'] = value
+            if 'summary' not in truncated:
+                truncated.append('summary')
+        fixed_tokens = count_tokens(render(capped_description, [], empty_sections))
+    if capped_description != job_description:
+        truncated.append('job_description')
+
+    # Relevant skills first so that, if the list must be cut, the matches survive.
+    skills = sorted(profile.get('skills', []), key=lambda s: not (words(s) & job_words))
+
+    kept_skills = []
+    remaining = budget - fixed_tokens
+    for skill in skills:
+        cost = count_tokens(skill) + 1
+        if cost > remaining:
+            truncated.append('skills')
+            break
+        kept_skills.append(skill)
+        remaining -= cost
+
+    entries = (
+        _section_entries('education', profile.get('education', []), _fmt_education, job_words)
+        + _section_entries('experience', profile.get('experience', []), _fmt_experience, job_words)
+        + _section_entries('projects', profile.get('projects', []), _fmt_project, job_words)
+    )
+    kept = []
+    # Ties keep the profile's own order, which is usually most recent first.
+    for entry in sorted(entries, key=lambda e: (-e.relevance, e.position)):
+        if entry.tokens <= remaining:
+            kept.append(entry)
+            remaining -= entry.tokens
+
+    def render_kept() -> str:
+        sections = {'education': [], 'experience': [], 'projects': []}
+        for entry in sorted(kept, key=lambda e: e.position):
+            sections[entry.section].append(entry.line)
+        return render(capped_description, kept_skills, sections)
+
+    # Per-item costs are estimates (tokens can merge across separators), so
+    # trim the least relevant items until the rendered prompt really fits.
+    text = render_kept()
+    tokens = count_tokens(text)
+    while tokens > budget and (kept or kept_skills):
+        if kept:
+            kept.pop()
+        else:
+            kept_skills.pop()
+            if 'skills' not in truncated:
+                truncated.append('skills')
+        text = render_kept()
+        tokens = count_tokens(text)
+    return BuiltPrompt(text, tokens, budget, len(entries) - len(kept), truncated)
+
+
+def build_keywords_prompt(job_description: str, budget: int = RESUME_PROMPT_BUDGET) -> BuiltPrompt:
+    capped = truncate_tokens(job_description, int(budget * JOB_DESCRIPTION_SHARE))
+    text = f"""Extract the top 10 most important keywords from this job description that should be in the resume:
+
+{capped}
+
+Return ONLY a comma-separated list of keywords, nothing else."""
+    return BuiltPrompt(text, count_tokens(text), budget, truncated=['job_description'] if capped != job_description else [])
+
+
+def build_cover_letter_prompt(job: dict, profile: dict, budget: int = COVER_LETTER_PROMPT_BUDGET) -> BuiltPrompt:
+    capped = truncate_tokens(job['description'], int(budget * JOB_DESCRIPTION_SHARE))
+    job_words = words(f"{job['title']} {job['description']}")
+    skills = sorted(profile.get('skills', []), key=lambda s: not (words(s) & job_words))
+    skills_text = truncate_tokens(", ".join(skills), int(budget * 0.25))
+    text = f"""Write a professional cover letter for this job application:
+
+Job Title: {job['title']}
+Company: {job['company']}
+Job Description: {capped}
+
+Candidate Name: {profile.get('name', '')}
+Candidate Skills: {skills_text}
+
+Write a concise, compelling cover letter (3-4 paragraphs) that highlights relevant experience and enthusiasm for the role."""
+    truncated = [name for name, changed in (('job_description', capped != job['description']),
+                                            ('skills', skills_text != ", ".join(skills))) if changed]
+    return BuiltPrompt(text, count_tokens(text), budget, truncated=truncated)
+
+
+SECTION_PROMPT_BUDGET = int(os.environ.get('RESUME_SECTION_TOKEN_BUDGET', 1200))
+MAX_FOCUS_TERMS = 25
+# A word in the job title says more about the role than one more mention in the description.
+TITLE_TERM_WEIGHT = 3
+
+SECTION_INSTRUCTIONS = {
+    'summary': 'Write a 3-4 sentence professional summary targeted at the job title, emphasizing the focus terms the candidate genuinely has.',
+    'skills': 'Write the skills section as a short comma-separated list per category, putting skills that match the focus terms first. Do not invent skills.',
+    'experience': 'Rewrite each experience entry as a role line followed by 2-4 concise bullet points, emphasizing the focus terms where truthful.',
+    'education': 'Write each education entry on one line: degree, field, institution and year.',
+    'projects': 'Rewrite each project as a name line followed by 1-3 concise bullet points, emphasizing the focus terms where truthful.',
+}
+
+
+def _terms(text: str) -> List[str]:
+    # 'MongoDB.' at the end of a sentence is the same term as 'MongoDB'.
+    return [term.rstrip('.') for term in WORD_RE.findall(text.lower())]
+
+
+def job_term_weights(job_title: str, job_description: str) -> Counter:
+    weights = Counter(_terms(job_description))
+    for term in _terms(job_title):
+        weights[term] += TITLE_TERM_WEIGHT
+    return Counter({
+        term: weight for term, weight in weights.items()
+        if term not in STOPWORDS and not term.replace('.', '').isdigit()
+    })
+
+
+def focus_terms(job_weights: Counter, material: str) -> List[str]:
+    """The most relevant job terms the candidate's own material mentions.
+
+    Section prompts see only these terms rather than the whole job
+    description, so two jobs that stress the same overlap produce the same
+    section inputs and can share a cached section. The top terms are listed
+    alphabetically so the cache key does not depend on their exact weights.
+    """
+    shared = [term for term in set(_terms(material)) if term in job_weights]
+    ranked = sorted(shared, key=lambda term: (-job_weights[term], term))
+    return sorted(ranked[:MAX_FOCUS_TERMS])
+
+
+def _fit_entries(entries: List[_Entry], budget: int) -> List[str]:
+    kept = []
+    remaining = budget
+    for entry in sorted(entries, key=lambda e: (-e.relevance, e.position)):
+        if entry.tokens <= remaining:
+            kept.append(entry)
+            remaining -= entry.tokens
+    return [entry.line for entry in sorted(kept, key=lambda e: e.position)]
+
+
+def resume_section_inputs(profile: dict, job_title: str, job_description: str,
+                          budget: int = SECTION_PROMPT_BUDGET) -> dict:
+    """Everything each LLM-written section depends on, and nothing more."""
+    job_words = words(f'{job_title} {job_description}')
+    job_weights = job_term_weights(job_title, job_description)
+    # Leave room for the instructions and focus terms around the entries.
+    entry_budget = budget // 2
+    skills = profile.get('skills', [])
+    experience = _section_entries('experience', profile.get('experience', []), _fmt_experience, job_words)
+    projects = _section_entries('projects', profile.get('projects', []), _fmt_project, job_words)
+    education = _section_entries('education', profile.get('education', []), _fmt_education, job_words)
+    summary_material = ' '.join([profile.get('summary') or '', ' '.join(skills)] + [e.line for e in experience + projects])
+
+    return {
+        'summary': {
+            'job_title': truncate_tokens(job_title, MAX_FIELD_TOKENS),
+            'summary': truncate_tokens(profile.get('summary') or '', MAX_ENTRY_TOKENS),
+            'roles': [truncate_tokens(f"{exp.get('title', '')} at {exp.get('company', '')}", MAX_FIELD_TOKENS)
+                      for exp in profile.get('experience', [])[:5]],
+            'focus': focus_terms(job_weights, summary_material),
+        },
+        'skills': {'skills': skills, 'focus': focus_terms(job_weights, ' '.join(skills))},
+        'experience': {
+            'entries': _fit_entries(experience, entry_budget),
+            'focus': focus_terms(job_weights, ' '.join(e.line for e in experience)),
+        },
+        'education': {'entries': _fit_entries(education, entry_budget)},
+        'projects': {
+            'entries': _fit_entries(projects, entry_budget),
+            'focus': focus_terms(job_weights, ' '.join(e.line for e in projects)),
+        },
+    }
+
+
+def _render_section_prompt(section: str, fields: dict) -> str:
+    lines = [
+        f'You are writing only the {section.upper()} section of an ATS-friendly, single-column, plain-text resume.',
+        SECTION_INSTRUCTIONS[section],
+    ]
+    if fields['job_title']:
+        lines.append(f"Target job title: {fields['job_title']}")
+    if fields['focus']:
+        lines.append(f"Focus terms from the job description: {', '.join(fields['focus'])}")
+    if fields['summary']:
+        lines.append(f"Candidate's own summary: {fields['summary']}")
+    if fields['roles']:
+        lines.append(f"Candidate's roles: {'; '.join(fields['roles'])}")
+    if fields['skills']:
+        lines.append(f"Candidate skills: {fields['skills']}")
+    if fields['entries']:
+        lines.append('Entries:\n' + '\n'.join(fields['entries']))
+    lines.append('Return ONLY the section body in plain text, without the section heading, tables or markdown.')
+    return '\n\n'.join(lines)
+
+
+def build_section_prompt(section: str, inputs: dict, budget: int = SECTION_PROMPT_BUDGET) -> BuiltPrompt:
+    skills = ', '.join(inputs.get('skills') or [])
+    fields = {
+        'job_title': inputs.get('job_title') or '',
+        'focus': list(inputs.get('focus') or []),
+        'summary': inputs.get('summary') or '',
+        'roles': list(inputs.get('roles') or []),
+        'skills': truncate_tokens(skills, budget // 4),
+        'entries': list(inputs.get('entries') or []),
+    }
+    truncated = ['skills'] if fields['skills'] != skills else []
+    dropped = 0
+
+    # The inputs are already capped, so only small budgets get here. Entries
+    # go first, oldest first, then roles and focus terms; the free-text
+    # fields then give up whatever is still over. The instructions are never cut.
+    text = _render_section_prompt(section, fields)
+    tokens = count_tokens(text)
+    while tokens > budget:
+        if fields['entries']:
+            fields['entries'].pop()
+            dropped += 1
+        elif fields['roles'] or fields['focus']:
+            name = 'roles' if fields['roles'] else 'focus'
+            fields[name].pop()
+            truncated.append(name)
+        else:
+            name = next((name for name in ('summary', 'skills', 'job_title') if fields[name]), None)
+            if name is None:
+                break
+            limit = count_tokens(fields[name]) - (tokens - budget) - 2
+            fields[name] = truncate_tokens(fields[name], limit) if limit > 0 else ''
+            truncated.append(name)
+        text = _render_section_prompt(section, fields)
+        tokens = count_tokens(text)
+    return BuiltPrompt(text, tokens, budget, dropped, list(dict.fromkeys(truncated)))
+
+
+def build_batch_cover_letter_prompt(jobs: List[dict], profile: dict,
+                                    budget: int = COVER_LETTER_PROMPT_BUDGET) -> BuiltPrompt:
+    """One prompt asking for a cover letter per job, sharing the candidate context.
+
+    ``budget`` applies per job; the candidate block is paid for once.
+    """
+    all_job_words = words(' '.join(f"{job['title']} {job['description']}" for job in jobs))
+    skills = sorted(profile.get('skills', []), key=lambda s: not (words(s) & all_job_words))
+    skills_text = truncate_tokens(", ".join(skills), int(budget * 0.25))
+
+    job_blocks = []
+    truncated = []
+    for i, job in enumerate(jobs, 1):
+        capped = truncate_tokens(job['description'], int(budget * JOB_DESCRIPTION_SHARE))
+        if capped != job['description']:
+            truncated.append(f'job_description_{i}')
+        job_blocks.append(f"""=== JOB {i} ===
+Job Title: {job['title']}
+Company: {job['company']}
+Job Description: {capped}""")
+
+    reply_format = '\n'.join(f'=== COVER LETTER {i} ===\n<cover letter for job {i}>' for i in range(1, len(jobs) + 1))
+    text = f"""Write a separate professional cover letter for each of the following {len(jobs)} job applications from the same candidate.
+
+Candidate Name: {profile.get('name', '')}
+Candidate Skills: {skills_text}
+
+{chr(10).join(job_blocks)}
+
+Each cover letter should be concise and compelling (3-4 paragraphs), highlighting relevant experience and enthusiasm for that specific role.
+
+Reply in exactly this format, with no other text:
+{reply_format}"""
+    return BuiltPrompt(text, count_tokens(text), budget * len(jobs), truncated=truncated)
@@ -0,0 +1,126 @@
+"""Resume generation as independent, cached sections.
+
+Contact info is rendered straight from the profile. Every other section is
+its own LLM call, run in parallel and cached under a hash of exactly the
+inputs its prompt uses (see ``prompts.resume_section_inputs``). Education
+never depends on the job, and the other sections only see the job through
+the focus terms they share with the profile, so later resumes for similar
+jobs, or after a small profile edit, regenerate only what changed.
+"""
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+import orjson
+
+from prompts import BuiltPrompt, build_section_prompt, resume_section_inputs
+
+# Bump when section prompts change so stale cached sections are not reused.
+SECTION_PROMPT_VERSION = 1
+SECTION_CACHE_TTL = timedelta(days=30)
+
+SECTION_HEADINGS = {
+    'contact': 'CONTACT INFO',
+    'summary': 'PROFESSIONAL SUMMARY',
+    'skills': 'SKILLS',
+    'experience': 'EXPERIENCE',
+    'education': 'EDUCATION',
+    'projects': 'PROJECTS',
+}
+LLM_SECTIONS = ('summary', 'skills', 'experience', 'education', 'projects')
+
+
+@dataclass
+class SectionedResume:
+    content: str
+    sections: Dict[str, str]
+    generated: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+    prompt_tokens: int = 0
+    elapsed_ms: float = 0
+
+
+def render_contact(profile: dict) -> str:
+    parts = [profile.get('name', ''), profile.get('email', ''), profile.get('phone'), profile.get('location')]
+    return ' | '.join(part for part in parts if part)
+
+
+def section_key(user_id: str, section: str, inputs: dict, model: str) -> str:
+    payload = orjson.dumps(
+        {'section': section, 'inputs': inputs, 'model': model, 'version': SECTION_PROMPT_VERSION},
+        option=orjson.OPT_SORT_KEYS
+    )
+    return f'{user_id}:{section}:{hashlib.sha256(payload).hexdigest()}'
+
+
+class SectionCache:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def ensure_indexes(self):
+        await self.collection.create_index('expires_at', expireAfterSeconds=0)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, str]:
+        docs = await self.collection.find({'_id': {'$in': keys}}, {'content': 1}).to_list(len(keys))
+        return {doc['_id']: doc['content'] for doc in docs}
+
+    async def put(self, key: str, content: str):
+        now = datetime.now(timezone.utc)
+        await self.collection.update_one(
+            {'_id': key},
+            {'$set': {'content': content, 'updated_at': now, 'expires_at': now + SECTION_CACHE_TTL}},
+            upsert=True
+        )
+
+    async def touch(self, keys: List[str]):
+        if keys:
+            await self.collection.update_many(
+                {'_id': {'$in': keys}},
+                {'$set': {'expires_at': datetime.now(timezone.utc) + SECTION_CACHE_TTL}}
+            )
+
+
+async def generate_sections(profile: dict, job_title: str, job_description: str, cache: SectionCache,
+                            send: Callable[[str, BuiltPrompt], Awaitable[str]], model: str) -> SectionedResume:
+    started = time.perf_counter()
+    all_inputs = resume_section_inputs(profile, job_title, job_description)
+    # Sections with nothing to write about (no projects, no education) are left out.
+    inputs = {
+        name: section_inputs for name, section_inputs in all_inputs.items()
+        if section_inputs.get('entries', True) and (name != 'skills' or section_inputs['skills'])
+    }
+    keys = {name: section_key(profile['user_id'], name, section_inputs, model) for name, section_inputs in inputs.items()}
+    cached = await cache.get_many(list(keys.values()))
+
+    missing = [name for name in LLM_SECTIONS if name in keys and keys[name] not in cached]
+    prompts = {name: build_section_prompt(name, inputs[name]) for name in missing}
+
+    async def generate(name: str) -> str:
+        content = (await send(f'section_{name}', prompts[name])).strip()
+        await cache.put(keys[name], content)
+        return content
+
+    results = await asyncio.gather(*(generate(name) for name in missing))
+    generated = dict(zip(missing, results))
+    reused = [name for name in LLM_SECTIONS if name in keys and name not in generated]
+    await cache.touch([keys[name] for name in reused])
+
+    sections = {'contact': render_contact(profile)}
+    for name in LLM_SECTIONS:
+        if name in generated:
+            sections[name] = generated[name]
+        elif name in keys:
+            sections[name] = cached[keys[name]]
+
+    content = '\n\n'.join(f'{SECTION_HEADINGS[name]}\n{body}' for name, body in sections.items())
+    return SectionedResume(
+        content=content,
+        sections=sections,
+        generated=missing,
+        reused=reused,
+        prompt_tokens=sum(prompt.tokens for prompt in prompts.values()),
+        elapsed_ms=(time.perf_counter() - started) * 1000
+    )
@@ -1,4 +1,7 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
@@ -12,27 +15,72 @@ import uuid
 from datetime import datetime, timezone, timedelta
 import jwt
 import bcrypt
-from emergentintegrations.llm.chat import LlmChat, UserMessage
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.enums import TA_LEFT
 import io
-from fastapi.responses import StreamingResponse
+import hmac
+import asyncio
+import inspect
+from functools import lru_cache
+from fastapi.responses import StreamingResponse, JSONResponse, ORJSONResponse, PlainTextResponse
 import random
+import metrics
+import profiling
+from admission import AdmissionController
+from catalog import CatalogStore, DEFAULT_JOBS
+from idempotency import IdempotencyStore, fingerprint
+from resume_sections import SectionCache, generate_sections
+from prompts import BuiltPrompt, build_resume_prompt, build_keywords_prompt
+from cover_letters import CoverLetterBatcher
+from exports import applied_between, export_fields, export_response, projection
+from llm_client import EmergentLlmBackend, LlmClient, LlmUnavailable, emergent_classes
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from ats import score_resume
+from profiling import profile_span
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+# Stored request profiles (speedscope JSON plus pstats text) expire after this long.
+PROFILE_RETENTION_SECONDS = int(os.environ.get('PROFILE_RETENTION_SECONDS', 7 * 24 * 3600))
+# Admin endpoints (metrics, stored profiles, full exports) use their own token so
+# that calling them neither requires nor triggers request profiling.
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# connect=False defers topology discovery to the startup warmup instead of import time.
+client = AsyncIOMotorClient(
+    mongo_url,
+    connect=False,
+    tz_aware=True,
+    event_listeners=[profiling.MongoCommandProfiler()] if PROFILE_TOKEN else []
+)
 db = client[os.environ['DB_NAME']]
+idempotency = IdempotencyStore(db.idempotency_keys)
+section_cache = SectionCache(db.resume_sections)
+job_catalog = CatalogStore(
+    Path(os.environ.get('CATALOG_DIR', ROOT_DIR / 'catalog')),
+    refresh_seconds=float(os.environ.get('CATALOG_REFRESH_SECONDS', 5))
+)
 
 app = FastAPI()
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
 security = HTTPBearer()
 
+LLM_PROVIDER = "gemini"
+LLM_MODEL = "gemini-3-flash-preview"
+llm = LlmClient.from_env(LLM_PROVIDER, LLM_MODEL)
+admission = AdmissionController.from_env(db, calls=llm.calls)
+# 'sections' builds resumes from independently cached sections; 'single' keeps the one-call prompt.
+RESUME_GENERATION_MODE = os.environ.get('RESUME_GENERATION_MODE', 'sections')
+MAX_BULK_APPLY = 10
+APPLICATION_STATUSES = ('Applied', 'Interview', 'Rejected', 'Offer')
+MAX_BULK_STATUS_UPDATES = 500
+RESCORE_BATCH_SIZE = 500
+# 'local' extracts resume keywords in-process and only asks the LLM when too few are found; 'llm' always asks.
+KEYWORDS_MODE = os.environ.get('KEYWORDS_MODE', 'local')
+MIN_LOCAL_KEYWORDS = 3
+
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key')
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 720
@@ -81,6 +129,10 @@ class Resume(BaseModel):
     job_description: str
     content: str
     keywords: List[str] = []
+    requirements: List[str] = []
+    ats_score: Optional[int] = None
+    missing_keywords: List[str] = []
+    prompt_tokens: Optional[int] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class Job(BaseModel):
@@ -116,6 +168,16 @@ class ApplicationUpdate(BaseModel):
 class JobApply(BaseModel):
     job_id: str
 
+class JobApplyBulk(BaseModel):
+    job_ids: List[str]
+
+class ApplicationStatusChange(BaseModel):
+    id: str
+    status: str
+
+class ApplicationStatusBulk(BaseModel):
+    updates: List[ApplicationStatusChange]
+
 
 def create_access_token(user_id: str, email: str) -> str:
     expiration = datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)
@@ -137,6 +199,58 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid token')
 
 
+async def send_prompt(name: str, prompt: BuiltPrompt, system_message: str) -> str:
+    metrics.observe(f'llm.prompt_tokens.{name}', prompt.tokens)
+    if prompt.truncated or prompt.dropped_entries:
+        logger.info(f"Trimmed {name} prompt to {prompt.tokens}/{prompt.budget} tokens "
+                    f"(dropped {prompt.dropped_entries} entries, truncated {prompt.truncated})")
+    started = time.perf_counter()
+    try:
+        async with profile_span(f'llm.{name}'):
+            response = await llm.complete(f"{name}_{uuid.uuid4()}", system_message, prompt.text)
+    except LlmUnavailable as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='AI service is temporarily unavailable',
+            headers={'Retry-After': str(int(e.retry_after))}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail='AI service timed out')
+    metrics.observe(f'llm.latency_ms.{name}', (time.perf_counter() - started) * 1000)
+    return response
+
+async def send_cover_letter_prompt(name: str, prompt: BuiltPrompt) -> str:
+    return await send_prompt(name, prompt, "You are an expert cover letter writer.")
+
+cover_letters = CoverLetterBatcher(send_cover_letter_prompt)
+
+# reportlab and emergentintegrations (litellm + provider SDKs) are the slowest
+# imports in the app, so they are loaded on first use or during warmup.
+@lru_cache(maxsize=None)
+def pdf_styles():
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_LEFT
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=14,
+        textColor='black',
+        spaceAfter=6,
+        alignment=TA_LEFT
+    )
+    body_style = ParagraphStyle(
+        'CustomBody',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor='black',
+        spaceAfter=6,
+        alignment=TA_LEFT
+    )
+    return title_style, body_style
+
+
 @api_router.get("/")
 async def root():
     return {"message": "AutoApply AI API is running"}
@@ -155,13 +269,11 @@ async def register(user_data: UserRegister):
     user = User(email=user_data.email, name=user_data.name)
     user_dict = user.model_dump()
     user_dict['password'] = hashed_password.decode('utf-8')
-    user_dict['created_at'] = user_dict['created_at'].isoformat()
     
     await db.users.insert_one(user_dict)
     
     profile = UserProfile(user_id=user.id, name=user.name, email=user.email)
     profile_dict = profile.model_dump()
-    profile_dict['updated_at'] = profile_dict['updated_at'].isoformat()
     await db.profiles.insert_one(profile_dict)
     
     token = create_access_token(user.id, user.email)
@@ -188,7 +300,6 @@ async def update_profile(profile_data: UserProfile, user: dict = Depends(verify_
     profile_data.user_id = user['user_id']
     profile_data.updated_at = datetime.now(timezone.utc)
     profile_dict = profile_data.model_dump()
-    profile_dict['updated_at'] = profile_dict['updated_at'].isoformat()
     
     await db.profiles.update_one(
         {'user_id': user['user_id']},
@@ -197,82 +308,89 @@ async def update_profile(profile_data: UserProfile, user: dict = Depends(verify_
     )
     return {'message': 'Profile updated successfully', 'profile': profile_dict}
 
+async def run_idempotent(endpoint: str, key: Optional[str], payload: dict, user: dict, response: Response, fn):
+    # Admission happens only when the work actually runs: replays of completed
+    # keys and duplicates waiting on an in-progress one spend no rate tokens.
+    async def admitted():
+        async with admission.admit(user['user_id']):
+            return await fn()
+    
+    if not key:
+        return await admitted()
+    result, replayed = await idempotency.run(f"{user['user_id']}:{endpoint}", key, fingerprint(payload), admitted)
+    if replayed:
+        response.headers['Idempotent-Replayed'] = 'true'
+    return result
+
 @api_router.post('/resume/generate')
-async def generate_resume(data: ResumeGenerate, user: dict = Depends(verify_token)):
+async def generate_resume(
+    data: ResumeGenerate,
+    response: Response,
+    user: dict = Depends(verify_token),
+    idempotency_key: Optional[str] = Header(None, alias='Idempotency-Key')
+):
+    return await run_idempotent(
+        'resume/generate', idempotency_key, data.model_dump(), user, response,
+        lambda: create_resume(data, user)
+    )
+
+async def create_resume(data: ResumeGenerate, user: dict, keywords: Optional[List[str]] = None,
+                        requirements: Optional[List[str]] = None) -> dict:
     profile = await db.profiles.find_one({'user_id': user['user_id']}, {'_id': 0})
     if not profile:
         raise HTTPException(status_code=404, detail='Profile not found. Please complete your profile first.')
     
-    api_key = os.environ.get('EMERGENT_LLM_KEY')
-    chat = LlmChat(
-        api_key=api_key,
-        session_id=f"resume_{user['user_id']}_{datetime.now().timestamp()}",
-        system_message="You are an expert ATS-friendly resume writer. Create professional, keyword-optimized resumes."
-    ).with_model("gemini", "gemini-3-flash-preview")
-    
-    profile_summary = f"""
-Name: {profile.get('name', '')}
-Email: {profile.get('email', '')}
-Phone: {profile.get('phone', 'N/A')}
-Location: {profile.get('location', 'N/A')}
-Summary: {profile.get('summary', 'N/A')}
-
-Skills: {", ".join(profile.get('skills', []))}
-
-Education:
-{chr(10).join([f"- {edu.get('degree', '')} in {edu.get('field', '')} from {edu.get('institution', '')} ({edu.get('year', '')})" for edu in profile.get('education', [])])}
-
-Experience:
-{chr(10).join([f"- {exp.get('title', '')} at {exp.get('company', '')} ({exp.get('duration', '')}): {exp.get('description', '')}" for exp in profile.get('experience', [])])}
-
-Projects:
-{chr(10).join([f"- {proj.get('name', '')}: {proj.get('description', '')}" for proj in profile.get('projects', [])])}
-"""
-    
-    prompt = f"""Create an ATS-friendly resume for the following job:
-
-Job Title: {data.job_title}
-Job Description: {data.job_description}
-
-Candidate Profile:
-{profile_summary}
-
-IMPORTANT REQUIREMENTS:
-1. Use a single-column layout (no tables)
-2. Extract and incorporate relevant keywords from the job description
-3. Optimize bullet points to match job requirements
-4. Keep formatting simple and ATS-scannable
-5. Highlight relevant skills and experience
-6. Return ONLY the resume content in plain text format, well-structured with clear sections
-7. Include these sections: Contact Info, Professional Summary, Skills, Experience, Education, Projects
-8. Do not include any images or complex formatting
-
-Generate the ATS-optimized resume now:"""
-    
-    message = UserMessage(text=prompt)
-    response = await chat.send_message(message)
+    system_message = "You are an expert ATS-friendly resume writer. Create professional, keyword-optimized resumes."
     
-    keywords_prompt = f"""Extract the top 10 most important keywords from this job description that should be in the resume:
-
-{data.job_description}
-
-Return ONLY a comma-separated list of keywords, nothing else."""
-    
-    keywords_message = UserMessage(text=keywords_prompt)
-    keywords_response = await chat.send_message(keywords_message)
-    keywords = [k.strip() for k in keywords_response.split(',')]
+    async def write_resume():
+        if RESUME_GENERATION_MODE == 'single':
+            resume_prompt = build_resume_prompt(profile, data.job_title, data.job_description)
+            return await send_prompt('resume', resume_prompt, system_message), resume_prompt.tokens
+        
+        async def send_section(name: str, prompt: BuiltPrompt) -> str:
+            return await send_prompt(name, prompt, system_message)
+        
+        sectioned = await generate_sections(
+            profile, data.job_title, data.job_description, section_cache, send_section, LLM_MODEL
+        )
+        metrics.observe('resume.sections.generated', len(sectioned.generated))
+        metrics.observe('resume.sections.reused', len(sectioned.reused))
+        metrics.observe('resume.sections.latency_ms', sectioned.elapsed_ms)
+        logger.info(f"Resume sections generated={sectioned.generated} reused={sectioned.reused} "
+                    f"in {sectioned.elapsed_ms:.0f}ms")
+        return sectioned.content, sectioned.prompt_tokens
+    
+    async def extract_keywords():
+        if keywords:
+            return keywords
+        if KEYWORDS_MODE == 'local':
+            started = time.perf_counter()
+            extractor = job_catalog.get().keyword_extractor
+            local = extractor.extract(f'{data.job_title}. {data.job_description}')
+            metrics.observe('keywords.local_ms', (time.perf_counter() - started) * 1000)
+            if len(local) >= MIN_LOCAL_KEYWORDS:
+                return local
+        keywords_response = await send_prompt('keywords', build_keywords_prompt(data.job_description), system_message)
+        return [k.strip() for k in keywords_response.split(',')]
+    
+    (response, prompt_tokens), resume_keywords = await asyncio.gather(write_resume(), extract_keywords())
+    coverage = score_resume(response, resume_keywords, requirements or [])
     
     resume = Resume(
         user_id=user['user_id'],
         job_title=data.job_title,
         job_description=data.job_description,
         content=response,
-        keywords=keywords
+        keywords=resume_keywords,
+        requirements=requirements or [],
+        ats_score=coverage['ats_score'],
+        missing_keywords=coverage['missing_keywords'],
+        prompt_tokens=prompt_tokens
     )
     
     resume_dict = resume.model_dump()
-    resume_dict['created_at'] = resume_dict['created_at'].isoformat()
-    await db.resumes.insert_one(resume_dict)
+    # insert_one adds an ObjectId _id to the dict it is given, which is not JSON serializable.
+    await db.resumes.insert_one(resume_dict.copy())
     
     return {'resume': resume_dict}
 
@@ -282,26 +400,13 @@ async def export_pdf(resume_id: str, user: dict = Depends(verify_token)):
     if not resume:
         raise HTTPException(status_code=404, detail='Resume not found')
     
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-    
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        textColor='black',
-        spaceAfter=6,
-        alignment=TA_LEFT
-    )
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor='black',
-        spaceAfter=6,
-        alignment=TA_LEFT
-    )
+    title_style, body_style = pdf_styles()
     
     story = []
     content_lines = resume['content'].split('\n')
@@ -317,7 +422,8 @@ async def export_pdf(resume_id: str, user: dict = Depends(verify_token)):
         else:
             story.append(Paragraph(line, body_style))
     
-    doc.build(story)
+    async with profile_span('pdf.build'):
+        doc.build(story)
     buffer.seek(0)
     
     return StreamingResponse(
@@ -331,105 +437,97 @@ async def search_jobs(user: dict = Depends(verify_token), platform: Optional[str
     profile = await db.profiles.find_one({'user_id': user['user_id']}, {'_id': 0})
     user_skills = profile.get('skills', []) if profile else []
     
-    dummy_jobs = [
-        {
-            'id': str(uuid.uuid4()),
-            'title': 'Senior Full Stack Developer',
-            'company': 'TechCorp',
-            'location': 'San Francisco, CA',
-            'description': 'We are looking for an experienced Full Stack Developer to join our team. Must have expertise in React, Node.js, and MongoDB.',
-            'requirements': ['React', 'Node.js', 'MongoDB', 'REST APIs', '5+ years experience'],
-            'salary_range': '$120k - $180k',
-            'job_type': 'Full-time',
-            'platform': 'LinkedIn',
-            'posted_date': (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
-        },
-        {
-            'id': str(uuid.uuid4()),
-            'title': 'AI/ML Engineer',
-            'company': 'InnovateLabs',
-            'location': 'Remote',
-            'description': 'Join our AI team to build cutting-edge machine learning solutions. Experience with Python, TensorFlow, and large-scale data processing required.',
-            'requirements': ['Python', 'TensorFlow', 'PyTorch', 'Machine Learning', 'Deep Learning'],
-            'salary_range': '$140k - $200k',
-            'job_type': 'Full-time',
-            'platform': 'Indeed',
-            'posted_date': (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
-        },
-        {
-            'id': str(uuid.uuid4()),
-            'title': 'Frontend Developer',
-            'company': 'DesignCo',
-            'location': 'New York, NY',
-            'description': 'Creative frontend developer needed for building beautiful user interfaces. Must be proficient in React, TypeScript, and modern CSS.',
-            'requirements': ['React', 'TypeScript', 'CSS', 'Responsive Design', 'Figma'],
-            'salary_range': '$90k - $130k',
-            'job_type': 'Full-time',
-            'platform': 'Wellfound',
-            'posted_date': (datetime.now(timezone.utc) - timedelta(days=3)).isoformat()
-        },
-        {
-            'id': str(uuid.uuid4()),
-            'title': 'DevOps Engineer',
-            'company': 'CloudSystems',
-            'location': 'Austin, TX',
-            'description': 'DevOps engineer to manage our cloud infrastructure. Experience with AWS, Docker, and Kubernetes is essential.',
-            'requirements': ['AWS', 'Docker', 'Kubernetes', 'CI/CD', 'Linux'],
-            'salary_range': '$110k - $160k',
-            'job_type': 'Full-time',
-            'platform': 'LinkedIn',
-            'posted_date': (datetime.now(timezone.utc) - timedelta(days=5)).isoformat()
-        },
-        {
-            'id': str(uuid.uuid4()),
-            'title': 'Data Scientist',
-            'company': 'DataDrive',
-            'location': 'Boston, MA',
-            'description': 'Data scientist to analyze large datasets and build predictive models. Strong statistical background required.',
-            'requirements': ['Python', 'SQL', 'Statistics', 'Machine Learning', 'Data Visualization'],
-            'salary_range': '$100k - $150k',
-            'job_type': 'Full-time',
-            'platform': 'Indeed',
-            'posted_date': (datetime.now(timezone.utc) - timedelta(days=4)).isoformat()
-        },
-        {
-            'id': str(uuid.uuid4()),
-            'title': 'Backend Developer',
-            'company': 'ServerTech',
-            'location': 'Seattle, WA',
-            'description': 'Backend developer for building scalable APIs. Experience with Python, FastAPI, and PostgreSQL required.',
-            'requirements': ['Python', 'FastAPI', 'PostgreSQL', 'REST APIs', 'Microservices'],
-            'salary_range': '$105k - $145k',
-            'job_type': 'Full-time',
-            'platform': 'Wellfound',
-            'posted_date': (datetime.now(timezone.utc) - timedelta(days=6)).isoformat()
-        }
-    ]
-    
-    for job in dummy_jobs:
-        if user_skills:
-            matching_skills = sum(1 for req in job['requirements'] if any(skill.lower() in req.lower() for skill in user_skills))
-            job['compatibility_score'] = min(95, int((matching_skills / len(job['requirements'])) * 100) + random.randint(10, 20))
+    catalog = job_catalog.get()
+    matching = catalog.matching_counts(user_skills) if user_skills else None
+    
+    jobs = []
+    for i in range(catalog.n_jobs):
+        job = catalog.job(i)
+        if platform and job['platform'].lower() != platform.lower():
+            continue
+        if matching is not None:
+            job['compatibility_score'] = min(95, int((matching[i] / catalog.requirement_count(i)) * 100) + random.randint(10, 20))
         else:
             job['compatibility_score'] = random.randint(60, 85)
+        jobs.append(job)
     
-    if platform:
-        dummy_jobs = [job for job in dummy_jobs if job['platform'].lower() == platform.lower()]
-    
-    dummy_jobs.sort(key=lambda x: x['compatibility_score'], reverse=True)
+    jobs.sort(key=lambda x: x['compatibility_score'], reverse=True)
     
-    return {'jobs': dummy_jobs}
+    return {'jobs': jobs}
 
 @api_router.post('/jobs/apply')
-async def apply_to_job(data: JobApply, user: dict = Depends(verify_token)):
+async def apply_to_job(
+    data: JobApply,
+    response: Response,
+    user: dict = Depends(verify_token),
+    idempotency_key: Optional[str] = Header(None, alias='Idempotency-Key')
+):
+    return await run_idempotent(
+        'jobs/apply', idempotency_key, data.model_dump(), user, response,
+        lambda: submit_application(data, user)
+    )
+
+async def submit_application(data: JobApply, user: dict) -> dict:
     jobs_response = await search_jobs(user)
     job = next((j for j in jobs_response['jobs'] if j['id'] == data.job_id), None)
+    resume = await prepare_application(job, user)
+    
+    profile = await db.profiles.find_one({'user_id': user['user_id']}, {'_id': 0})
+    cover_letter = await cover_letters.request(user['user_id'], profile, job)
+    
+    app_dict = await record_application(job, resume, cover_letter, user)
+    return {'message': 'Application submitted successfully', 'application': app_dict}
+
+@api_router.post('/jobs/apply/bulk')
+async def apply_to_jobs(data: JobApplyBulk, user: dict = Depends(verify_token)):
+    job_ids = list(dict.fromkeys(data.job_ids))
+    # Admission charges one token per job, so the cap can be no larger than a full bucket.
+    limit = min(MAX_BULK_APPLY, admission.max_cost)
+    if not job_ids or len(job_ids) > limit:
+        raise HTTPException(status_code=400, detail=f'Provide between 1 and {limit} job ids')
     
+    # Each job is a full resume generation plus a cover letter, so each costs what a single apply does.
+    async with admission.admit(user['user_id'], cost=len(job_ids)):
+        return await submit_applications(job_ids, user)
+
+async def submit_applications(job_ids: List[str], user: dict) -> dict:
+    jobs_response = await search_jobs(user)
+    jobs_by_id = {j['id']: j for j in jobs_response['jobs']}
+    prepared = await asyncio.gather(
+        *(prepare_application(jobs_by_id.get(job_id), user) for job_id in job_ids),
+        return_exceptions=True
+    )
+    
+    results = {}
+    ready = []
+    for job_id, outcome in zip(job_ids, prepared):
+        if isinstance(outcome, HTTPException):
+            results[job_id] = {'job_id': job_id, 'status_code': outcome.status_code, 'error': outcome.detail}
+        elif isinstance(outcome, Exception):
+            raise outcome
+        else:
+            ready.append((jobs_by_id[job_id], outcome))
+    
+    if ready:
+        # One batched prompt covers every cover letter in the request.
+        profile = await db.profiles.find_one({'user_id': user['user_id']}, {'_id': 0})
+        letters = await cover_letters.request_many(user['user_id'], profile, [job for job, _ in ready])
+        for (job, resume), cover_letter in zip(ready, letters):
+            try:
+                app_dict = await record_application(job, resume, cover_letter, user)
+                results[job['id']] = {'job_id': job['id'], 'status_code': 200, 'application': app_dict}
+            except HTTPException as exc:
+                results[job['id']] = {'job_id': job['id'], 'status_code': exc.status_code, 'error': exc.detail}
+    
+    return {'results': [results[job_id] for job_id in job_ids]}
+
+async def prepare_application(job: Optional[dict], user: dict) -> dict:
+    """Validate that the user can apply to ``job`` and generate its tailored resume."""
     if not job:
         raise HTTPException(status_code=404, detail='Job not found')
     
     existing_application = await db.applications.find_one(
-        {'user_id': user['user_id'], 'job_id': data.job_id},
+        {'user_id': user['user_id'], 'job_id': job['id']},
         {'_id': 0}
     )
     if existing_application:
@@ -439,34 +537,15 @@ async def apply_to_job(data: JobApply, user: dict = Depends(verify_token)):
         job_description=job['description'],
         job_title=job['title']
     )
-    resume_response = await generate_resume(resume_data, user)
-    resume = resume_response['resume']
-    
-    api_key = os.environ.get('EMERGENT_LLM_KEY')
-    chat = LlmChat(
-        api_key=api_key,
-        session_id=f"cover_letter_{user['user_id']}_{datetime.now().timestamp()}",
-        system_message="You are an expert cover letter writer."
-    ).with_model("gemini", "gemini-3-flash-preview")
-    
-    profile = await db.profiles.find_one({'user_id': user['user_id']}, {'_id': 0})
-    cover_letter_prompt = f"""Write a professional cover letter for this job application:
-
-Job Title: {job['title']}
-Company: {job['company']}
-Job Description: {job['description']}
-
-Candidate Name: {profile.get('name', '')}
-Candidate Skills: {", ".join(profile.get('skills', []))}
+    resume_response = await create_resume(
+        resume_data, user, keywords=job.get('keywords'), requirements=job.get('requirements')
+    )
+    return resume_response['resume']
 
-Write a concise, compelling cover letter (3-4 paragraphs) that highlights relevant experience and enthusiasm for the role."""
-    
-    cover_letter_message = UserMessage(text=cover_letter_prompt)
-    cover_letter = await chat.send_message(cover_letter_message)
-    
+async def record_application(job: dict, resume: dict, cover_letter: str, user: dict) -> dict:
     application = Application(
         user_id=user['user_id'],
-        job_id=data.job_id,
+        job_id=job['id'],
         job_title=job['title'],
         company=job['company'],
         status='Applied',
@@ -475,23 +554,39 @@ Write a concise, compelling cover letter (3-4 paragraphs) that highlights releva
     )
     
     app_dict = application.model_dump()
-    app_dict['applied_at'] = app_dict['applied_at'].isoformat()
-    app_dict['updated_at'] = app_dict['updated_at'].isoformat()
-    await db.applications.insert_one(app_dict)
-    
-    return {'message': 'Application submitted successfully', 'application': app_dict}
+    try:
+        await db.applications.insert_one(app_dict.copy())
+    except DuplicateKeyError:
+        # A concurrent request for the same job won the race past the find_one check above.
+        raise HTTPException(status_code=400, detail='Already applied to this job')
+    return app_dict
 
 @api_router.get('/applications')
 async def get_applications(user: dict = Depends(verify_token)):
-    applications = await db.applications.find({'user_id': user['user_id']}, {'_id': 0}).to_list(1000)
-    applications.sort(key=lambda x: x['applied_at'], reverse=True)
-    return {'applications': applications}
+    applications = await db.applications.find(
+        {'user_id': user['user_id']}, {'_id': 0}
+    ).sort('applied_at', -1).to_list(1000)
+    # Documents are plain BSON types, so skip jsonable_encoder and let orjson serialize them directly.
+    return ORJSONResponse({'applications': applications})
+
+@api_router.get('/applications/export')
+async def export_applications(format: str = 'ndjson', fields: Optional[str] = None,
+                              start: Optional[datetime] = None, end: Optional[datetime] = None,
+                              user: dict = Depends(verify_token)):
+    columns = export_fields(fields)
+    cursor = db.applications.find(
+        {'user_id': user['user_id'], **applied_between(start, end)}, projection(columns)
+    ).sort('applied_at', 1)
+    return export_response(cursor, format, columns, 'applications')
 
 @api_router.put('/applications/{application_id}')
 async def update_application(application_id: str, data: ApplicationUpdate, user: dict = Depends(verify_token)):
+    if data.status not in APPLICATION_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Choose from: {', '.join(APPLICATION_STATUSES)}")
+    
     result = await db.applications.update_one(
         {'id': application_id, 'user_id': user['user_id']},
-        {'$set': {'status': data.status, 'updated_at': datetime.now(timezone.utc).isoformat()}}
+        {'$set': {'status': data.status, 'updated_at': datetime.now(timezone.utc)}}
     )
     
     if result.modified_count == 0:
@@ -499,14 +594,174 @@ async def update_application(application_id: str, data: ApplicationUpdate, user:
     
     return {'message': 'Application status updated successfully'}
 
+@api_router.post('/applications/status/bulk')
+async def update_applications_status(data: ApplicationStatusBulk, user: dict = Depends(verify_token)):
+    if not data.updates or len(data.updates) > MAX_BULK_STATUS_UPDATES:
+        raise HTTPException(status_code=400, detail=f'Provide between 1 and {MAX_BULK_STATUS_UPDATES} updates')
+    
+    # The last change wins when an id repeats within one request.
+    changes = {change.id: change.status for change in data.updates}
+    results = {}
+    for application_id, new_status in changes.items():
+        if new_status not in APPLICATION_STATUSES:
+            results[application_id] = {'id': application_id, 'status_code': 400,
+                                       'error': f"Invalid status. Choose from: {', '.join(APPLICATION_STATUSES)}"}
+    
+    # bulk_write only reports aggregate counts, so one lookup tells apart missing ids and no-op changes.
+    valid_ids = [application_id for application_id in changes if application_id not in results]
+    current = {
+        doc['id']: doc['status'] async for doc in db.applications.find(
+            {'id': {'$in': valid_ids}, 'user_id': user['user_id']}, {'_id': 0, 'id': 1, 'status': 1}
+        )
+    }
+    
+    now = datetime.now(timezone.utc)
+    pending = []
+    for application_id in valid_ids:
+        if application_id not in current:
+            results[application_id] = {'id': application_id, 'status_code': 404, 'error': 'Application not found'}
+        elif current[application_id] == changes[application_id]:
+            results[application_id] = {'id': application_id, 'status_code': 200, 'status': changes[application_id], 'updated': False}
+        else:
+            pending.append(application_id)
+    
+    if pending:
+        operations = [
+            UpdateOne(
+                {'id': application_id, 'user_id': user['user_id']},
+                {'$set': {'status': changes[application_id], 'updated_at': now}}
+            )
+            for application_id in pending
+        ]
+        failed = {}
+        try:
+            await db.applications.bulk_write(operations, ordered=False)
+        except BulkWriteError as exc:
+            failed = {error['index']: error.get('errmsg', 'Update failed') for error in exc.details.get('writeErrors', [])}
+        for index, application_id in enumerate(pending):
+            if index in failed:
+                results[application_id] = {'id': application_id, 'status_code': 500, 'error': failed[index]}
+            else:
+                results[application_id] = {'id': application_id, 'status_code': 200, 'status': changes[application_id], 'updated': True}
+    
+    return {'results': [results[application_id] for application_id in changes]}
+
+def rescore_updates(resumes: List[dict], user_id: str) -> List[UpdateOne]:
+    updates = []
+    for resume in resumes:
+        coverage = score_resume(resume.get('content', ''), resume.get('keywords', []), resume.get('requirements', []))
+        updates.append(UpdateOne(
+            {'id': resume['id'], 'user_id': user_id},
+            {'$set': {'ats_score': coverage['ats_score'], 'missing_keywords': coverage['missing_keywords']}}
+        ))
+    return updates
+
+@api_router.post('/resumes/rescore')
+async def rescore_resumes(user: dict = Depends(verify_token)):
+    started = time.perf_counter()
+    cursor = db.resumes.find(
+        {'user_id': user['user_id']},
+        {'_id': 0, 'id': 1, 'content': 1, 'keywords': 1, 'requirements': 1}
+    ).batch_size(RESCORE_BATCH_SIZE)
+    
+    rescored = 0
+    batch = []
+    async for resume in cursor:
+        batch.append(resume)
+        if len(batch) == RESCORE_BATCH_SIZE:
+            # Scoring a full batch takes over 100ms of CPU; keep it off the event loop.
+            await db.resumes.bulk_write(await asyncio.to_thread(rescore_updates, batch, user['user_id']), ordered=False)
+            rescored += len(batch)
+            batch = []
+    if batch:
+        await db.resumes.bulk_write(await asyncio.to_thread(rescore_updates, batch, user['user_id']), ordered=False)
+        rescored += len(batch)
+    
+    elapsed = time.perf_counter() - started
+    return {'rescored': rescored, 'elapsed_ms': round(elapsed * 1000, 1)}
+
 @api_router.get('/resumes')
 async def get_resumes(user: dict = Depends(verify_token)):
-    resumes = await db.resumes.find({'user_id': user['user_id']}, {'_id': 0}).to_list(1000)
-    resumes.sort(key=lambda x: x['created_at'], reverse=True)
-    return {'resumes': resumes}
+    resumes = await db.resumes.find(
+        {'user_id': user['user_id']}, {'_id': 0}
+    ).sort('created_at', -1).to_list(1000)
+    return ORJSONResponse({'resumes': resumes})
+
+def header_matches(request: Request, header: str, expected: Optional[str]) -> bool:
+    supplied = request.headers.get(header, '')
+    return bool(expected) and hmac.compare_digest(supplied, expected)
+
+def has_admin_token(request: Request) -> bool:
+    return header_matches(request, 'X-Admin-Token', ADMIN_TOKEN)
+
+def wants_profile(request: Request) -> bool:
+    return header_matches(request, 'X-Profile-Token', PROFILE_TOKEN)
+
+@api_router.get('/admin/profiles/{profile_id}')
+async def get_request_profile(profile_id: str, request: Request, format: str = 'speedscope'):
+    if not has_admin_token(request):
+        raise HTTPException(status_code=403, detail='Admin token required')
+    doc = await db.request_profiles.find_one({'id': profile_id}, {'_id': 0})
+    if not doc:
+        raise HTTPException(status_code=404, detail='Profile not found')
+    if format == 'pstats':
+        return PlainTextResponse(doc['cprofile'])
+    return JSONResponse(
+        doc['speedscope'],
+        headers={'Content-Disposition': f'attachment; filename="profile_{profile_id}.speedscope.json"'}
+    )
+
+@api_router.get('/admin/metrics')
+async def get_metrics(request: Request):
+    if not has_admin_token(request):
+        raise HTTPException(status_code=403, detail='Admin token required')
+    return {'metrics': metrics.snapshot()}
+
+@api_router.get('/admin/applications/export')
+async def export_all_applications(request: Request, format: str = 'ndjson', fields: Optional[str] = None,
+                                  start: Optional[datetime] = None, end: Optional[datetime] = None):
+    if not has_admin_token(request):
+        raise HTTPException(status_code=403, detail='Admin token required')
+    columns = export_fields(fields)
+    # Natural order: sorting the whole collection would need an in-memory sort.
+    cursor = db.applications.find(applied_between(start, end), projection(columns))
+    return export_response(cursor, format, columns, 'applications_all')
 
 app.include_router(api_router)
 
+async def profiled_body(profile: profiling.RequestProfile, body):
+    # Streamed responses (exports) do their work here, after call_next has returned.
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        profile.stop()
+        await db.request_profiles.insert_one(profile.to_document())
+        logger.info(f"Profiled {profile.method} {profile.path} in {profile.duration * 1000:.1f}ms as {profile.id}")
+
+# Registered only when PROFILE_TOKEN is configured, so unprofiled deployments pay nothing.
+if PROFILE_TOKEN:
+    @app.middleware('http')
+    async def profile_request(request: Request, call_next):
+        with profiling.request_running():
+            if not wants_profile(request) or request.url.path.startswith('/api/admin/profiles'):
+                return await call_next(request)
+
+            profile = profiling.RequestProfile(request.method, request.url.path)
+            token = profiling.activate(profile)
+            profile.start()
+            try:
+                response = await call_next(request)
+            except BaseException:
+                profile.stop()
+                raise
+            finally:
+                profiling.deactivate(token)
+
+        response.headers['X-Profile-Id'] = profile.id
+        response.body_iterator = profiled_body(profile, response.body_iterator)
+        return response
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -521,6 +776,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+logger.info(f"Imported server module in {(time.perf_counter() - _IMPORT_STARTED) * 1000:.1f}ms")
+
+async def timed_phase(name: str, fn):
+    started = time.perf_counter()
+    result = fn()
+    if inspect.isawaitable(result):
+        await result
+    logger.info(f"Startup phase '{name}' took {(time.perf_counter() - started) * 1000:.1f}ms")
+
+async def warm_llm_client():
+    try:
+        await timed_phase('llm_import', lambda: asyncio.to_thread(emergent_classes))
+    except Exception:
+        logger.exception('LLM client warmup failed; it will be imported on first use')
+
+async def ensure_indexes():
+    await db.applications.create_index([('user_id', 1), ('applied_at', -1)])
+    await db.resumes.create_index([('user_id', 1), ('created_at', -1)])
+    await idempotency.ensure_indexes()
+    await section_cache.ensure_indexes()
+    try:
+        await db.applications.create_index([('user_id', 1), ('job_id', 1)], unique=True)
+    except OperationFailure:
+        logger.warning('Duplicate applications exist; skipping unique (user_id, job_id) index')
+    if admission.shared_users is not None:
+        await db.rate_limits.create_index('updated', expireAfterSeconds=3600)
+    if PROFILE_TOKEN:
+        await db.request_profiles.create_index('created_at', expireAfterSeconds=PROFILE_RETENTION_SECONDS)
+
+@app.on_event("startup")
+async def warmup():
+    started = time.perf_counter()
+    await timed_phase('mongo_connect', lambda: client.admin.command('ping'))
+    await timed_phase('mongo_indexes', ensure_indexes)
+    await timed_phase('pdf_styles', pdf_styles)
+    await timed_phase('job_catalog', lambda: (job_catalog.ensure_published(DEFAULT_JOBS), job_catalog.refresh()))
+    # The LLM stack is not needed to serve health checks, so it loads in the
+    # background after the worker starts accepting traffic.
+    if isinstance(llm.backend, EmergentLlmBackend):
+        app.state.llm_warmup = asyncio.create_task(warm_llm_client())
+    logger.info(f"Startup warmup finished in {(time.perf_counter() - started) * 1000:.1f}ms")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
\ No newline at end of file
@@ -0,0 +1,160 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from llm_client import CallLimiter, CircuitBreaker, FakeLlmBackend, LlmClient, LlmUnavailable  # noqa: E402
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def failing_client(backend, **kwargs):
+    kwargs.setdefault('breaker', CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+    return LlmClient(backend, attempts=1, backoff_max=0.01, hedge=False, **kwargs)
+
+
+def test_breaker_opens_then_recovers_through_half_open_trial():
+    async def scenario():
+        backend = FakeLlmBackend(latency=lambda: 0.001, fault_rate=1.0)
+        client = failing_client(backend)
+        with pytest.raises(ConnectionError):
+            await client.complete('s', 'system', 'prompt')
+        with pytest.raises(LlmUnavailable):
+            await client.complete('s', 'system', 'prompt')
+        assert backend.calls == 1
+
+        await asyncio.sleep(0.06)
+        backend.fault_rate = 0.0
+        assert (await client.complete('s', 'system', 'prompt')).startswith('Fake reply')
+        assert client.breaker.opened_at is None
+
+    run(scenario())
+
+
+def test_failed_half_open_trial_reopens_breaker():
+    async def scenario():
+        backend = FakeLlmBackend(latency=lambda: 0.001, fault_rate=1.0)
+        client = failing_client(backend)
+        with pytest.raises(ConnectionError):
+            await client.complete('s', 'system', 'prompt')
+        await asyncio.sleep(0.06)
+        with pytest.raises(ConnectionError):
+            await client.complete('s', 'system', 'prompt')
+        with pytest.raises(LlmUnavailable):
+            await client.complete('s', 'system', 'prompt')
+        assert backend.calls == 2
+
+    run(scenario())
+
+
+def test_cancelled_half_open_trial_does_not_wedge_breaker():
+    async def scenario():
+        backend = FakeLlmBackend(latency=lambda: 0.001, fault_rate=1.0)
+        client = failing_client(backend)
+        with pytest.raises(ConnectionError):
+            await client.complete('s', 'system', 'prompt')
+        await asyncio.sleep(0.06)
+
+        backend.latency = lambda: 1.0
+        backend.fault_rate = 0.0
+        client.deadline = 0.05
+        with pytest.raises(asyncio.TimeoutError):
+            await client.complete('s', 'system', 'prompt')
+
+        backend.latency = lambda: 0.001
+        client.deadline = 5
+        assert (await client.complete('s', 'system', 'prompt')).startswith('Fake reply')
+
+    run(scenario())
+
+
+def test_deadline_cancels_backend_calls():
+    async def scenario():
+        backend = FakeLlmBackend(latency=lambda: 1.0)
+        client = LlmClient(backend, deadline=0.05, hedge=False)
+        with pytest.raises(asyncio.TimeoutError):
+            await client.complete('s', 'system', 'prompt')
+        assert backend.in_flight == 0
+
+    run(scenario())
+
+
+def test_deadline_during_hedge_wait_cancels_primary():
+    async def scenario():
+        backend = FakeLlmBackend(latency=lambda: 0.001)
+        client = LlmClient(backend, deadline=0.05, hedge_floor=0.2)
+        for _ in range(20):
+            await client.complete('s', 'system', 'prompt')
+
+        backend.latency = lambda: 1.0
+        with pytest.raises(asyncio.TimeoutError):
+            await client.complete('s', 'system', 'prompt')
+        assert backend.in_flight == 0
+
+    run(scenario())
+
+
+def test_hedge_answers_when_primary_stalls():
+    async def scenario():
+        latencies = iter([0.001] * 20 + [1.0, 0.001])
+        backend = FakeLlmBackend(latency=lambda: next(latencies))
+        client = LlmClient(backend, hedge_floor=0.02)
+        for _ in range(20):
+            await client.complete('s', 'system', 'prompt')
+
+        started = asyncio.get_running_loop().time()
+        assert (await client.complete('s', 'system', 'prompt')).startswith('Fake reply')
+        assert asyncio.get_running_loop().time() - started < 0.5
+        assert backend.calls == 22
+        assert backend.in_flight == 0
+
+    run(scenario())
+
+
+def test_retries_recover_from_transient_faults():
+    async def scenario():
+        backend = FakeLlmBackend(latency=lambda: 0.001, fault_rate=0.5, seed=3)
+        client = LlmClient(backend, attempts=10, backoff_max=0.001, hedge=False,
+                           breaker=CircuitBreaker(failure_threshold=100))
+        replies = [await client.complete('s', 'system', 'prompt') for _ in range(20)]
+        assert len(replies) == 20
+        assert backend.calls > 20
+
+    run(scenario())
+
+
+def test_call_limiter_bounds_concurrent_backend_calls():
+    async def scenario():
+        peak = 0
+
+        def latency():
+            nonlocal peak
+            peak = max(peak, backend.in_flight)
+            return 0.01
+
+        backend = FakeLlmBackend(latency=latency)
+        client = LlmClient(backend, calls=CallLimiter(max_inflight=4, max_queued=100))
+        replies = await asyncio.gather(*(client.complete(f's{i}', 'system', 'prompt') for i in range(40)))
+        assert len(replies) == 40
+        assert peak == 4
+        assert client.calls.inflight == 0 and client.calls.queued == 0
+
+    run(scenario())
+
+
+def test_call_limiter_reports_saturation():
+    async def scenario():
+        backend = FakeLlmBackend(latency=lambda: 0.05)
+        client = LlmClient(backend, hedge=False, calls=CallLimiter(max_inflight=1, max_queued=2))
+        tasks = [asyncio.ensure_future(client.complete(f's{i}', 'system', 'prompt')) for i in range(3)]
+        await asyncio.sleep(0.01)
+        assert client.calls.saturated
+        await asyncio.gather(*tasks)
+        assert not client.calls.saturated
+
+    run(scenario())